@@ -0,0 +1,34 @@
+"""add adaptive sync schedule columns
+
+Revision ID: 384afa3dd67e
+Revises: a9aa190cb39a
+Create Date: 2026-10-17 14:48:33.270561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '384afa3dd67e'
+down_revision: Union[str, Sequence[str], None] = 'a9aa190cb39a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sync_state', sa.Column('next_sync_at', sa.DateTime(), nullable=True))
+    op.add_column('sync_state', sa.Column('sync_interval_seconds', sa.Integer(), nullable=True))
+    op.add_column('sync_state', sa.Column('activity_rate', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_sync_state_next_sync_at'), 'sync_state', ['next_sync_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sync_state_next_sync_at'), table_name='sync_state')
+    op.drop_column('sync_state', 'activity_rate')
+    op.drop_column('sync_state', 'sync_interval_seconds')
+    op.drop_column('sync_state', 'next_sync_at')
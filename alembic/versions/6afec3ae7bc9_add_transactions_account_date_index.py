@@ -0,0 +1,31 @@
+"""add transactions account date index
+
+Revision ID: 6afec3ae7bc9
+Revises: 6ca5dab54395
+Create Date: 2026-10-17 12:20:48.306115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6afec3ae7bc9'
+down_revision: Union[str, Sequence[str], None] = '6ca5dab54395'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_from_account_date', 'transactions',
+        ['from_account_id', 'transaction_date', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_from_account_date', table_name='transactions')
@@ -0,0 +1,43 @@
+"""add owner user_id to registered_users
+
+Revision ID: 6ca5dab54395
+Revises: fa58e66feb9f
+Create Date: 2026-10-17 12:02:37.915406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ca5dab54395'
+down_revision: Union[str, Sequence[str], None] = 'fa58e66feb9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('registered_users', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_registered_users_user_id'), 'registered_users', ['user_id'], unique=False)
+    op.create_index(op.f('ix_registered_users_email'), 'registered_users', ['email'], unique=False)
+    op.create_foreign_key(
+        'fk_registered_users_user_id_users', 'registered_users', 'users',
+        ['user_id'], ['id'], ondelete='SET NULL'
+    )
+
+    # Backfill owners from the email match that used to be done at query time
+    op.execute(
+        "UPDATE registered_users SET user_id = "
+        "(SELECT users.id FROM users WHERE users.email = registered_users.email)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_registered_users_user_id_users', 'registered_users', type_='foreignkey')
+    op.drop_index(op.f('ix_registered_users_email'), table_name='registered_users')
+    op.drop_index(op.f('ix_registered_users_user_id'), table_name='registered_users')
+    op.drop_column('registered_users', 'user_id')
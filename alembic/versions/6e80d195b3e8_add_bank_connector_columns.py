@@ -0,0 +1,30 @@
+"""add bank connector columns
+
+Revision ID: 6e80d195b3e8
+Revises: fbe8c2c2c2e3
+Create Date: 2026-10-17 13:20:41.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e80d195b3e8'
+down_revision: Union[str, Sequence[str], None] = 'fbe8c2c2c2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bank', sa.Column('connector_type', sa.String(length=50), server_default='http', nullable=False))
+    op.add_column('bank', sa.Column('connector_config', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bank', 'connector_config')
+    op.drop_column('bank', 'connector_type')
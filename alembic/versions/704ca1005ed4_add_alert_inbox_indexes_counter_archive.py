@@ -0,0 +1,50 @@
+"""add alert inbox indexes, unread counter and archive
+
+Revision ID: 704ca1005ed4
+Revises: 384afa3dd67e
+Create Date: 2026-10-17 15:32:07.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '704ca1005ed4'
+down_revision: Union[str, Sequence[str], None] = '384afa3dd67e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('alerts_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('budget_id', sa.Integer(), nullable=True),
+    sa.Column('alert_type', sa.Enum('BUDGET_80_PERCENT', 'BUDGET_100_PERCENT', 'OVERALL_BALANCE_LIMIT', name='alerttype'), nullable=False),
+    sa.Column('message', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_alerts_archive_user_id'), 'alerts_archive', ['user_id'], unique=False)
+    op.create_index('ix_alerts_user_read_created', 'alerts', ['user_id', 'is_read', 'created_at', 'id'], unique=False)
+    op.create_index('ix_alerts_user_created', 'alerts', ['user_id', 'created_at', 'id'], unique=False)
+    op.add_column('users', sa.Column('unread_alert_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill the counter from the alerts already there
+    op.execute(
+        "UPDATE users SET unread_alert_count = "
+        "(SELECT COUNT(*) FROM alerts WHERE alerts.user_id = users.id AND alerts.is_read = 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'unread_alert_count')
+    op.drop_index('ix_alerts_user_created', table_name='alerts')
+    op.drop_index('ix_alerts_user_read_created', table_name='alerts')
+    op.drop_index(op.f('ix_alerts_archive_user_id'), table_name='alerts_archive')
+    op.drop_table('alerts_archive')
@@ -0,0 +1,37 @@
+"""add sync_state table
+
+Revision ID: a9aa190cb39a
+Revises: b01b189f7351
+Create Date: 2026-10-17 14:25:08.913274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9aa190cb39a'
+down_revision: Union[str, Sequence[str], None] = 'b01b189f7351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_state',
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('last_transaction_at', sa.DateTime(), nullable=True),
+        sa.Column('cursor', sa.String(length=255), nullable=True),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['account_id'], ['registered_users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('account_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_state')
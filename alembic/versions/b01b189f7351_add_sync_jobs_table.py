@@ -0,0 +1,42 @@
+"""add sync_jobs table
+
+Revision ID: b01b189f7351
+Revises: 0279aa8c4ed7
+Create Date: 2026-10-17 14:02:17.385520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b01b189f7351'
+down_revision: Union[str, Sequence[str], None] = '0279aa8c4ed7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('trigger', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='syncjobstatus'), nullable=False),
+        sa.Column('current_stage', sa.String(length=50), nullable=True),
+        sa.Column('stages', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_jobs_created_at'), 'sync_jobs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sync_jobs_created_at'), table_name='sync_jobs')
+    op.drop_table('sync_jobs')
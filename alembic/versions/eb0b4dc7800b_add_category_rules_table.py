@@ -0,0 +1,39 @@
+"""add category_rules table
+
+Revision ID: eb0b4dc7800b
+Revises: 6afec3ae7bc9
+Create Date: 2026-10-17 12:41:09.552817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eb0b4dc7800b'
+down_revision: Union[str, Sequence[str], None] = '6afec3ae7bc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_rules',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('keyword', sa.String(length=100), nullable=False),
+        sa.Column('category', sa.Enum('TRAVEL', 'FOOD', 'HOUSEHOLD', 'HEALTH', 'ANONYMOUS', 'INCOME', name='transactioncategory'), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('keyword')
+    )
+    op.create_index(op.f('ix_category_rules_id'), 'category_rules', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_rules_id'), table_name='category_rules')
+    op.drop_table('category_rules')
@@ -0,0 +1,50 @@
+"""add alert dedup key
+
+Revision ID: fa58e66feb9f
+Revises: a1bbca78705c
+Create Date: 2026-10-17 11:45:12.481302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa58e66feb9f'
+down_revision: Union[str, Sequence[str], None] = 'a1bbca78705c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('alerts', sa.Column('dedup_key', sa.String(length=100), nullable=True))
+
+    # Backfill keys for unread alerts; older duplicates keep a NULL key
+    bind = op.get_bind()
+    unread = bind.execute(sa.text(
+        "SELECT id, user_id, budget_id, alert_type FROM alerts WHERE is_read = 0 ORDER BY id"
+    )).fetchall()
+    seen = set()
+    for alert_id, user_id, budget_id, alert_type in unread:
+        if budget_id is not None:
+            key = f"{alert_type}:budget:{budget_id}"
+        else:
+            key = f"{alert_type}:user:{user_id}"
+        if key in seen:
+            continue
+        seen.add(key)
+        bind.execute(
+            sa.text("UPDATE alerts SET dedup_key = :key WHERE id = :id"),
+            {"key": key, "id": alert_id}
+        )
+
+    op.create_unique_constraint('uq_alerts_dedup_key', 'alerts', ['dedup_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_alerts_dedup_key', 'alerts', type_='unique')
+    op.drop_column('alerts', 'dedup_key')
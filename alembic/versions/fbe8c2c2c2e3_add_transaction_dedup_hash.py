@@ -0,0 +1,75 @@
+"""add transaction dedup hash
+
+Revision ID: fbe8c2c2c2e3
+Revises: eb0b4dc7800b
+Create Date: 2026-10-17 12:58:26.740193
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fbe8c2c2c2e3'
+down_revision: Union[str, Sequence[str], None] = 'eb0b4dc7800b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def _as_datetime(value):
+    # Drivers without a native DATETIME (SQLite) hand back strings
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _dedup_hash(from_account_id, amount, transaction_date, transaction_type):
+    # Frozen copy of services.dedup.generate_transaction_hash for rows with no
+    # external_id and no description (neither was stored before this revision)
+    hash_string = (
+        f"{from_account_id}_{float(amount or 0):.2f}_{_as_datetime(transaction_date).isoformat()}_"
+        f"{transaction_type}_"
+    )
+    return hashlib.sha256(hash_string.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('dedup_hash', sa.String(length=64), nullable=True))
+
+    # Backfill in id order; exact repeats of an earlier row keep a NULL hash
+    bind = op.get_bind()
+    seen = set()
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(
+            "SELECT id, from_account_id, amount, transaction_date, transaction_type "
+            "FROM transactions WHERE id > :last_id ORDER BY id LIMIT :batch"
+        ), {"last_id": last_id, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = []
+        for tx_id, from_account_id, amount, transaction_date, transaction_type in rows:
+            value = _dedup_hash(from_account_id, amount, transaction_date, transaction_type)
+            if value not in seen:
+                seen.add(value)
+                updates.append({"id": tx_id, "dedup_hash": value})
+        if updates:
+            bind.execute(sa.text("UPDATE transactions SET dedup_hash = :dedup_hash WHERE id = :id"), updates)
+        last_id = rows[-1][0]
+
+    op.create_unique_constraint('uq_transactions_dedup_hash', 'transactions', ['dedup_hash'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_transactions_dedup_hash', 'transactions', type_='unique')
+    op.drop_column('transactions', 'dedup_hash')
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: sync (threadpool) vs async route handlers.
+
+Serves the same account-history read two ways from one uvicorn process:
+    /sync/transactions/{id}   def handler, get_db, blocking driver in Starlette's threadpool
+    /async/transactions/{id}  async def handler, get_async_db, async driver on the event loop
+and drives each with the same number of concurrent clients, reporting
+requests/sec and p50/p99 latency.
+
+Uses a throwaway SQLite database unless DATABASE_URL is set; point it at a
+MySQL instance (mysql://...) to compare PyMySQL with aiomysql, where the
+network round trip is what the threadpool blocks on.
+
+Usage:
+    python benchmark_async_routes.py [clients] [requests_per_client]   (default: 500 20)
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Process
+
+if "DATABASE_URL" not in os.environ:
+    DB_FILE = os.path.join(tempfile.gettempdir(), "bench_async_routes.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.database import engine, async_engine, SessionLocal, get_db, get_async_db
+from schema.models import Base, Bank, RegisteredUser, Transaction, TransactionType, TransactionCategory
+from controller.TransactionController import get_transactions_page, get_transactions_page_async
+from routes.TransactionRoutes import TransactionPage
+
+HOST, PORT = "127.0.0.1", 8765
+ACCOUNT_ROWS = 5000
+PAGE_SIZE = 20
+
+app = FastAPI()
+
+
+@app.get("/sync/transactions/{account_id}", response_model=TransactionPage)
+def sync_transactions(account_id: int, db: Session = Depends(get_db)):
+    items, next_cursor = get_transactions_page(db, account_id, PAGE_SIZE)
+    return TransactionPage(items=items, next_cursor=next_cursor)
+
+
+@app.get("/async/transactions/{account_id}", response_model=TransactionPage)
+async def async_transactions(account_id: int, db: AsyncSession = Depends(get_async_db)):
+    items, next_cursor = await get_transactions_page_async(db, account_id, PAGE_SIZE)
+    return TransactionPage(items=items, next_cursor=next_cursor)
+
+
+def seed() -> int:
+    engine.echo = False
+    Base.metadata.drop_all(bind=engine, tables=[Transaction.__table__, RegisteredUser.__table__, Bank.__table__])
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    bank = Bank(bank_name="Bench Bank")
+    db.add(bank)
+    db.flush()
+    account = RegisteredUser(
+        account_number="000000000001", ifsc_code="BENC0000001",
+        phone_no="9000000000", email="bench@example.com", bank_id=bank.id, account_balance=0.0
+    )
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    db.close()
+
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Transaction), [
+            {
+                "from_account_id": account_id,
+                "transaction_type": TransactionType.DEBIT,
+                "amount": 10.0,
+                "category": TransactionCategory.FOOD,
+                "transaction_date": start + timedelta(minutes=k),
+                "balance_after_transaction": 0.0,
+            }
+            for k in range(ACCOUNT_ROWS)
+        ])
+    return account_id
+
+
+def serve():
+    # Forked from the seeding process: don't reuse its connections
+    engine.dispose(close=False)
+    engine.echo = async_engine.echo = False
+    uvicorn.run(app, host=HOST, port=PORT, log_level="warning")
+
+
+async def load(path: str, clients: int, per_client: int):
+    latencies = []
+    failures = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{PORT}", limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal failures
+            for _ in range(per_client):
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        await client.get(path)  # warm up connections and the pool
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, latencies, failures
+
+
+def report(label, rps, latencies, failures):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"  {label:<6} {rps:10.0f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms   failures {failures}")
+
+
+def run(clients, per_client):
+    account_id = seed()
+    server = Process(target=serve, daemon=True)
+    server.start()
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://{HOST}:{PORT}/docs")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        print(f"{clients} concurrent clients x {per_client} requests, page of {PAGE_SIZE} from {ACCOUNT_ROWS} rows")
+        for label in ("sync", "async"):
+            rps, latencies, failures = asyncio.run(load(f"/{label}/transactions/{account_id}", clients, per_client))
+            report(label, rps, latencies, failures)
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(clients, per_client)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the budget recompute step of the sync workflow.
+
+Seeds a throwaway SQLite database with N DEBIT transactions and counts the
+SQL statements issued by recompute_budget_spent(), the full sync's budget stage.
+The statement count should stay constant as N grows.
+
+Usage:
+    python benchmark_budget_recompute.py [N ...]   (default: 1000 10000 100000 1000000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import random
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_budget.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from sqlalchemy import event, insert, delete
+from db.database import engine, SessionLocal
+from schema.models import Base, User, Bank, RegisteredUser, Budget, Transaction, TransactionType, TransactionCategory
+from services.sync_service import recompute_budget_spent
+
+USERS = 50
+ACCOUNTS_PER_USER = 2
+CATEGORIES = [c for c in TransactionCategory if c != TransactionCategory.INCOME]
+
+
+def seed_reference_data():
+    """Create users, accounts and one budget per (user, category)"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    bank = Bank(bank_name="Bench Bank")
+    db.add(bank)
+    db.flush()
+    account_ids = []
+    for i in range(USERS):
+        user = User(name=f"User {i}", email=f"user{i}@bench.local", password="x", phone_no=f"90000{i:05d}")
+        db.add(user)
+        db.flush()
+        for category in CATEGORIES:
+            db.add(Budget(user_id=user.id, category=category, monthly_limit=10000.0, current_spent=0.0))
+        for j in range(ACCOUNTS_PER_USER):
+            acc = RegisteredUser(
+                account_number=f"{i:06d}{j:04d}", ifsc_code="BENC0000001",
+                phone_no=user.phone_no, email=user.email, bank_id=bank.id, account_balance=0.0
+            )
+            db.add(acc)
+            db.flush()
+            account_ids.append(acc.id)
+    db.commit()
+    db.close()
+    return account_ids
+
+
+def seed_transactions(account_ids, count):
+    """Top the transactions table up to `count` rows"""
+    with engine.begin() as conn:
+        conn.execute(delete(Transaction))
+        start = datetime(2025, 1, 1)
+        chunk = 50000
+        for offset in range(0, count, chunk):
+            rows = [
+                {
+                    "from_account_id": random.choice(account_ids),
+                    "transaction_type": TransactionType.DEBIT,
+                    "amount": round(random.uniform(10, 500), 2),
+                    "category": random.choice(CATEGORIES),
+                    "transaction_date": start + timedelta(minutes=offset + k),
+                    "balance_after_transaction": 0.0,
+                }
+                for k in range(min(chunk, count - offset))
+            ]
+            conn.execute(insert(Transaction), rows)
+
+
+def run(sizes):
+    account_ids = seed_reference_data()
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    print(f"{'transactions':>12} | {'statements':>10} | {'seconds':>8}")
+    print("-" * 38)
+    for size in sizes:
+        seed_transactions(account_ids, size)
+        statements.clear()
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            recompute_budget_spent(db)
+            db.commit()
+        finally:
+            db.close()
+        elapsed = time.perf_counter() - started
+        print(f"{size:>12} | {len(statements):>10} | {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000, 1000000]
+    run(sizes)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark for transaction ingest: N calls to POST /transactions/ versus one
+call to POST /transactions/bulk carrying the same N rows, against the same
+throwaway SQLite database.
+
+Usage:
+    python benchmark_bulk_ingest.py [N]   (default: 2000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import logging
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_bulk.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from fastapi.testclient import TestClient
+from db.database import engine
+import server
+
+engine.echo = False
+logging.getLogger("httpx").setLevel(logging.WARNING)
+client = TestClient(server.app)
+
+
+def seed():
+    user = client.post("/users/", json={
+        "name": "Bench User", "email": "bench@example.com", "password": "benchpass", "phone_no": "9000000000"
+    }).json()
+    bank = client.post("/banks/", json={"bank_name": "Bench Bank"}).json()
+    accounts = [
+        client.post("/registered-accounts/", json={
+            "account_number": f"00000000000{i}", "ifsc_code": "BENC0000001", "phone_no": "9000000000",
+            "email": "bench@example.com", "bank_id": bank["id"], "account_balance": 1_000_000.0
+        }).json()["id"]
+        for i in range(4)
+    ]
+    client.post("/budgets/", json={"user_id": user["id"], "category": "FOOD", "monthly_limit": 1e12})
+    return accounts
+
+
+def make_rows(accounts, count):
+    return [
+        {
+            "from_account_id": accounts[i % len(accounts)],
+            "transaction_type": "DEBIT",
+            "amount": 10.0 + i % 7,
+            "category": "FOOD",
+            "balance_after_transaction": 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+def run(count):
+    accounts = seed()
+    rows = make_rows(accounts, count)
+
+    started = time.perf_counter()
+    for row in rows:
+        response = client.post("/transactions/", json=row)
+        assert response.status_code == 201, response.text
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    response = client.post("/transactions/bulk", json={"transactions": rows})
+    bulk_seconds = time.perf_counter() - started
+    assert response.json()["created"] == count, response.text
+
+    print(f"{count} rows per mode")
+    print(f"{'mode':>8} | {'seconds':>8} | {'rows/s':>10}")
+    print("-" * 33)
+    print(f"{'single':>8} | {single_seconds:>8.3f} | {count / single_seconds:>10.0f}")
+    print(f"{'bulk':>8} | {bulk_seconds:>8.3f} | {count / bulk_seconds:>10.0f}")
+    print(f"speedup: {single_seconds / bulk_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
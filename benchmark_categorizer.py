@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for transaction auto-categorization.
+
+Compares the compiled KeywordCategorizer with the previous
+any(keyword in description ...) scan, first on the built-in keyword table
+and then with 10k extra merchant rules. The old scan is too slow to run on
+every description with 10k rules, so it is timed on a sample and
+extrapolated. Both implementations are checked to agree on the sample.
+
+Usage:
+    python benchmark_categorizer.py [descriptions] [rules]   (default: 1000000 10000)
+"""
+
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from schema.models import TransactionCategory
+from services.categorizer import KeywordCategorizer, DEFAULT_RULES, default_rules
+
+LEGACY_SAMPLE = 20000
+WORDS = ["payment", "upi", "pos", "neft", "txn", "ref", "card", "online", "store", "mumbai", "delhi", "pvt", "ltd"]
+
+
+def legacy_categorize(description, keyword_lists):
+    """The previous algorithm: scan each category's keyword list in priority order"""
+    description_lower = description.lower()
+    for category, keywords in keyword_lists:
+        if any(keyword in description_lower for keyword in keywords):
+            return category
+    return TransactionCategory.ANONYMOUS
+
+
+def make_merchant_rules(count):
+    categories = [c for c in TransactionCategory if c != TransactionCategory.ANONYMOUS]
+    return [(f"merchant{i:05d}", categories[i % len(categories)], 60 + i % 5) for i in range(count)]
+
+
+def make_descriptions(count, vocabulary):
+    rng = random.Random(42)
+    descriptions = []
+    for _ in range(count):
+        words = rng.sample(WORDS, 3)
+        if rng.random() < 0.7:
+            words.insert(rng.randrange(4), rng.choice(vocabulary).upper())
+        descriptions.append(" ".join(words) + f" {rng.randrange(10**6):06d}")
+    return descriptions
+
+
+def keyword_lists_for(rules):
+    grouped = {}
+    for keyword, category, priority in rules:
+        grouped.setdefault((priority, category), []).append(keyword)
+    return [(category, keywords) for (priority, category), keywords in sorted(grouped.items(), key=lambda item: item[0][0])]
+
+
+def bench(label, rules, descriptions):
+    keyword_lists = keyword_lists_for(rules)
+
+    started = time.perf_counter()
+    categorizer = KeywordCategorizer(rules)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = categorizer.categorize_many(descriptions)
+    compiled_seconds = time.perf_counter() - started
+
+    sample = descriptions[:LEGACY_SAMPLE]
+    started = time.perf_counter()
+    legacy = [legacy_categorize(d, keyword_lists) for d in sample]
+    legacy_seconds = (time.perf_counter() - started) * len(descriptions) / len(sample)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+    print(f"{label}: {len(rules)} rules, {len(descriptions)} descriptions")
+    print(f"  build automaton : {build_seconds:8.3f} s")
+    print(f"  compiled        : {compiled_seconds:8.3f} s")
+    print(f"  legacy (est.)   : {legacy_seconds:8.3f} s  (timed on {len(sample)})")
+    print(f"  speedup         : {legacy_seconds / compiled_seconds:8.1f}x")
+    print(f"  mismatches      : {mismatches} / {len(sample)}")
+
+
+def run(description_count, rule_count):
+    builtin = default_rules()
+    builtin_words = [keyword for _, _, keywords in DEFAULT_RULES for keyword in keywords]
+    bench("built-in rules", builtin, make_descriptions(description_count, builtin_words))
+
+    merchants = make_merchant_rules(rule_count)
+    vocabulary = builtin_words + [keyword for keyword, _, _ in merchants]
+    bench("built-in + merchant rules", builtin + merchants, make_descriptions(description_count, vocabulary))
+
+
+if __name__ == "__main__":
+    descriptions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rules = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    run(descriptions, rules)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ORM + response_model vs the lean column/orjson read path.
+
+Seeds a throwaway SQLite database with N users, N registered accounts and
+N transactions on one account, then serves each list endpoint two ways
+from one app:
+    orm   today's path: ORM objects validated through the response_model
+          and encoded by FastAPI's JSON encoder
+    lean  the app's routes: only the response columns, as Rows encoded
+          with orjson (db/lean_query.py); transactions go through a copy of
+          the app's handler without its 500-row limit
+Each request goes through the full ASGI stack with a TestClient. The script
+reports the median latency of each and checks both return the same JSON.
+
+Usage:
+    python benchmark_lean_reads.py [rows] [repeats]   (default: 10000 20)
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_lean_reads.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.database import engine, get_read_db, get_async_read_db
+from schema.models import Base, Bank, User, RegisteredUser, Transaction, TransactionType, TransactionCategory
+from controller.TransactionController import transactions_by_account_query, get_transactions_by_account_async
+from db.lean_query import response_columns, lean_response
+from routes import UserRoutes, RegisteredAccountRoutes
+from routes.UserRoutes import UserResponse
+from routes.RegisteredAccountRoutes import RegisteredAccountResponse
+from routes.TransactionRoutes import TransactionResponse
+
+app = FastAPI()
+app.include_router(UserRoutes.router)
+app.include_router(RegisteredAccountRoutes.router)
+
+
+@app.get("/orm/users/", response_model=List[UserResponse])
+def orm_users(db: Session = Depends(get_read_db)):
+    return db.query(User).all()
+
+
+@app.get("/orm/registered-accounts/", response_model=List[RegisteredAccountResponse])
+def orm_accounts(db: Session = Depends(get_read_db)):
+    return db.query(RegisteredUser).all()
+
+
+@app.get("/orm/transactions/account/{account_id}", response_model=List[TransactionResponse])
+async def orm_transactions(account_id: int, limit: int = 50, db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.execute(transactions_by_account_query(account_id, limit))).scalars().all()
+
+
+@app.get("/lean/transactions/account/{account_id}")
+async def lean_transactions(account_id: int, limit: int = 50, db: AsyncSession = Depends(get_async_read_db)):
+    columns = response_columns(Transaction, TransactionResponse)
+    return lean_response(await get_transactions_by_account_async(db, account_id, limit, 0, columns))
+
+
+def seed(rows):
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    now = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        bank_id = conn.execute(insert(Bank).values(bank_name="Bench Bank")).inserted_primary_key[0]
+        conn.execute(insert(User), [
+            {
+                "name": f"Bench User {i}", "email": f"user{i}@bench.local", "password": "x",
+                "phone_no": f"9{i:09d}", "overall_balance_limit": 1000.0 if i % 2 else None,
+            }
+            for i in range(rows)
+        ])
+        conn.execute(insert(RegisteredUser), [
+            {
+                "account_number": f"{i:012d}", "ifsc_code": "BENC0000001", "phone_no": f"9{i:09d}",
+                "email": f"user{i}@bench.local", "bank_id": bank_id, "user_id": i + 1,
+                "account_balance": 100.0 + i,
+            }
+            for i in range(rows)
+        ])
+        account_id = conn.execute(select(RegisteredUser.id).limit(1)).scalar()
+        conn.execute(insert(Transaction), [
+            {
+                "from_account_id": account_id,
+                "transaction_type": TransactionType.DEBIT if i % 3 else TransactionType.CREDIT,
+                "amount": 10.0 + i % 97,
+                "category": TransactionCategory.FOOD,
+                "transaction_date": now + timedelta(minutes=i, microseconds=i),
+                "balance_after_transaction": 5000.0 - i,
+            }
+            for i in range(rows)
+        ])
+    return account_id
+
+
+def median_ms(client, url, repeats):
+    client.get(url)  # Warm up caches and the connection pool
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+    return statistics.median(samples), response
+
+
+def run(rows, repeats):
+    account_id = seed(rows)
+    endpoints = [
+        ("GET /users/", "/orm/users/", "/users/"),
+        ("GET /registered-accounts/", "/orm/registered-accounts/", "/registered-accounts/"),
+        ("GET /transactions/account/{id}", f"/orm/transactions/account/{account_id}?limit={rows}",
+         f"/lean/transactions/account/{account_id}?limit={rows}"),
+    ]
+
+    print(f"{rows} rows per response, median of {repeats} requests")
+    print(f"{'endpoint':<32} | {'orm ms':>8} | {'lean ms':>8} | {'speedup':>7} | {'KB':>6} | same")
+    print("-" * 80)
+    with TestClient(app) as client:
+        for name, orm_url, lean_url in endpoints:
+            orm_ms, orm_response = median_ms(client, orm_url, repeats)
+            lean_ms, lean_body = median_ms(client, lean_url, repeats)
+            same = orm_response.json() == lean_body.json()
+            print(
+                f"{name:<32} | {orm_ms:>8.1f} | {lean_ms:>8.1f} | {orm_ms / lean_ms:>6.1f}x | "
+                f"{len(lean_body.content) / 1024:>6.0f} | {'yes' if same else 'NO'}"
+            )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(rows, repeats)
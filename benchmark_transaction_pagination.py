@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /transactions/account/{account_id} paging.
+
+Seeds a throwaway SQLite database with one busy account and compares the
+latency of page 1 and a deep page for OFFSET paging and keyset (cursor)
+paging. Keyset latency should stay flat with page depth.
+
+Usage:
+    python benchmark_transaction_pagination.py [deep_page] [page_size]   (default: 10000 50)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import statistics
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_pagination.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from sqlalchemy import insert
+from db.database import engine, SessionLocal
+from schema.models import Base, Bank, RegisteredUser, Transaction, TransactionType, TransactionCategory
+from controller.TransactionController import get_transactions_by_account, get_transactions_page
+from controller.pagination import encode_cursor
+
+REPEATS = 20
+
+
+def seed(total_rows):
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    bank = Bank(bank_name="Bench Bank")
+    db.add(bank)
+    db.flush()
+    account = RegisteredUser(
+        account_number="000000000001", ifsc_code="BENC0000001",
+        phone_no="9000000000", email="bench@bench.local", bank_id=bank.id, account_balance=0.0
+    )
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    db.close()
+
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        chunk = 50000
+        for offset in range(0, total_rows, chunk):
+            conn.execute(insert(Transaction), [
+                {
+                    "from_account_id": account_id,
+                    "transaction_type": TransactionType.DEBIT,
+                    "amount": 10.0,
+                    "category": TransactionCategory.FOOD,
+                    "transaction_date": start + timedelta(minutes=offset + k),
+                    "balance_after_transaction": 0.0,
+                }
+                for k in range(min(chunk, total_rows - offset))
+            ])
+    return account_id
+
+
+def median_ms(fn):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(deep_page, page_size):
+    total_rows = deep_page * page_size
+    account_id = seed(total_rows)
+    db = SessionLocal()
+
+    # Cursor pointing just before the deep page, as a client walking pages would hold
+    boundary = (
+        db.query(Transaction)
+        .filter(Transaction.from_account_id == account_id)
+        .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+        .offset((deep_page - 1) * page_size - 1)
+        .first()
+    )
+    deep_cursor = encode_cursor(boundary.transaction_date, boundary.id)
+
+    results = {
+        ("offset", 1): median_ms(lambda: get_transactions_by_account(db, account_id, page_size, 0)),
+        ("offset", deep_page): median_ms(
+            lambda: get_transactions_by_account(db, account_id, page_size, (deep_page - 1) * page_size)
+        ),
+        ("keyset", 1): median_ms(lambda: get_transactions_page(db, account_id, page_size, None)),
+        ("keyset", deep_page): median_ms(lambda: get_transactions_page(db, account_id, page_size, deep_cursor)),
+    }
+    db.close()
+
+    print(f"{total_rows} transactions, page size {page_size}, median of {REPEATS} runs")
+    print(f"{'mode':>8} | {'page':>7} | {'ms':>8}")
+    print("-" * 30)
+    for (mode, page), ms in results.items():
+        print(f"{mode:>8} | {page:>7} | {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    deep_page = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    run(deep_page, page_size)
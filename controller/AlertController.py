@@ -1,7 +1,59 @@
 # controller/AlertController.py
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import select, insert, update, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from schema.models import Alert, AlertType, User, Budget
+from schema.models import Alert, AlertType, User, Budget, RegisteredUser
+from controller.pagination import encode_cursor, decode_cursor
+
+
+def alert_dedup_key(alert_type: AlertType, user_id: int, budget_id: Optional[int] = None) -> str:
+    """Key held by an unread alert; the unique index on it stops duplicate unread alerts"""
+    if budget_id is not None:
+        return f"{alert_type.value}:budget:{budget_id}"
+    return f"{alert_type.value}:user:{user_id}"
+
+
+def adjust_unread_count(db: Session, user_id: int, delta: int):
+    """Move a user's unread_alert_count by `delta` in the caller's transaction"""
+    if delta:
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(unread_alert_count=User.unread_alert_count + delta)
+        )
+
+
+def refresh_unread_counts(db: Session, user_ids) -> None:
+    """Recount the unread alerts of `user_ids` (indexed on user_id, is_read)"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    unread = (
+        select(func.count(Alert.id))
+        .where(Alert.user_id == User.id, Alert.is_read == 0)
+        .scalar_subquery()
+    )
+    db.execute(update(User).where(User.id.in_(user_ids)).values(unread_alert_count=unread))
+
+
+def insert_alerts_ignoring_duplicates(db: Session, rows: List[dict]) -> int:
+    """Bulk-insert alert rows, letting the dedup_key unique index silently drop duplicates"""
+    if not rows:
+        return 0
+    stmt = (
+        insert(Alert)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    result = db.connection().execute(stmt, rows)
+    if result.rowcount:
+        # Core inserts skip the ORM flush; flag them for the alert stream's after_commit hook
+        db.info["alerts_created"] = True
+        # Some rows may have been ignored, so recount rather than add
+        refresh_unread_counts(db, {row["user_id"] for row in rows})
+    return result.rowcount
 
 def create_alert(
     db: Session,
@@ -15,10 +67,12 @@ def create_alert(
         budget_id=budget_id,
         alert_type=alert_type,
         message=message,
-        is_read=0
+        is_read=0,
+        dedup_key=alert_dedup_key(alert_type, user_id, budget_id)
     )
     db.add(alert)
     db.flush()
+    adjust_unread_count(db, user_id, 1)
     db.refresh(alert)
     return alert
 
@@ -27,18 +81,84 @@ def get_alert_by_id(db: Session, alert_id: int) -> Optional[Alert]:
     return db.query(Alert).filter(Alert.id == alert_id).first()
 
 
-def get_alerts_by_user(db: Session, user_id: int, unread_only: bool = False) -> List[Alert]:
+def get_alerts_by_user(db: Session, user_id: int, unread_only: bool = False, limit: Optional[int] = None) -> List[Alert]:
     query = db.query(Alert).filter(Alert.user_id == user_id)
     if unread_only:
         query = query.filter(Alert.is_read == 0)
-    return query.order_by(Alert.created_at.desc()).all()
+    return query.order_by(Alert.created_at.desc(), Alert.id.desc()).limit(limit).all()
+
+
+async def get_alerts_by_user_async(
+    db: AsyncSession, user_id: int, unread_only: bool = False, limit: Optional[int] = None
+) -> List[Alert]:
+    query = select(Alert).where(Alert.user_id == user_id)
+    if unread_only:
+        query = query.where(Alert.is_read == 0)
+    query = query.order_by(Alert.created_at.desc(), Alert.id.desc()).limit(limit)
+    return (await db.execute(query)).scalars().all()
+
+
+def alerts_page_query(user_id: int, limit: int = 50, cursor: Optional[str] = None, unread_only: bool = False):
+    """Keyset page of a user's alerts, newest first, seeking on (created_at, id).
+
+    Served by ix_alerts_user_read_created (unread only) or
+    ix_alerts_user_created. Fetches one row more than `limit` to tell whether
+    another page follows. Raises ValueError for a malformed cursor.
+    """
+    query = select(Alert).where(Alert.user_id == user_id)
+    if unread_only:
+        query = query.where(Alert.is_read == 0)
+
+    if cursor:
+        last_created, last_id = decode_cursor(cursor)
+        query = query.where(
+            Alert.created_at <= last_created,
+            or_(
+                Alert.created_at < last_created,
+                Alert.id < last_id
+            )
+        )
+
+    return (
+        query
+        .order_by(Alert.created_at.desc(), Alert.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def _split_alert_page(rows: List[Alert], limit: int) -> Tuple[List[Alert], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+async def get_alerts_page_async(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    unread_only: bool = False
+) -> Tuple[List[Alert], Optional[str]]:
+    """A page of the user's inbox and the cursor for the next one (None on the last page)"""
+    rows = (await db.execute(alerts_page_query(user_id, limit, cursor, unread_only))).scalars().all()
+    return _split_alert_page(rows, limit)
+
+
+async def get_unread_alert_count_async(db: AsyncSession, user_id: int) -> Optional[int]:
+    """The user's maintained unread counter (a primary-key read); None if there is no such user"""
+    return (await db.execute(select(User.unread_alert_count).where(User.id == user_id))).scalar()
 
 
 def mark_alert_as_read(db: Session, alert_id: int) -> Optional[Alert]:
     alert = db.query(Alert).filter(Alert.id == alert_id).first()
     if alert:
-        alert.is_read = 1
-        db.flush()
+        # Guarded on is_read: of two concurrent requests only one flips it and moves the counter
+        marked = db.query(Alert).filter(Alert.id == alert_id, Alert.is_read == 0).update(
+            {"is_read": 1, "dedup_key": None}, synchronize_session=False
+        )
+        adjust_unread_count(db, alert.user_id, -marked)
         db.refresh(alert)
     return alert
 
@@ -47,98 +167,130 @@ def mark_all_alerts_as_read(db: Session, user_id: int) -> int:
     count = db.query(Alert).filter(
         Alert.user_id == user_id,
         Alert.is_read == 0
-    ).update({"is_read": 1})
+    ).update({"is_read": 1, "dedup_key": None})
+    adjust_unread_count(db, user_id, -count)
     db.flush()
     return count
 
 
 def delete_alert(db: Session, alert_id: int) -> bool:
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
-    if alert:
-        db.delete(alert)
+    user_id = db.query(Alert.user_id).filter(Alert.id == alert_id).scalar()
+    if user_id is None:
+        return False
+    # The counter moves only if the row deleted was still unread, whatever a concurrent
+    # mark-read or delete did in between
+    unread = db.query(Alert).filter(Alert.id == alert_id, Alert.is_read == 0).delete(synchronize_session=False)
+    adjust_unread_count(db, user_id, -unread)
+    if unread:
         return True
-    return False
+    return db.query(Alert).filter(Alert.id == alert_id).delete(synchronize_session=False) > 0
 
 
-def check_and_generate_budget_alerts(db: Session, user_id: int) -> List[Alert]:
-    """Check budgets and generate alerts at 80% and 100% thresholds"""
-    generated_alerts = []
-    
-    # Get all budgets for the user
-    budgets = db.query(Budget).filter(Budget.user_id == user_id).all()
-    
-    for budget in budgets:
-        if budget.monthly_limit <= 0:
-            continue
-            
-        percentage = (budget.current_spent / budget.monthly_limit) * 100
-        
-        # Check for 100% threshold
-        if percentage >= 100:
-            # Check if alert already exists for this budget at 100%
-            existing_alert = db.query(Alert).filter(
-                Alert.budget_id == budget.id,
-                Alert.alert_type == AlertType.BUDGET_100_PERCENT,
-                Alert.is_read == 0
-            ).first()
-            
-            if not existing_alert:
-                message = f"Budget exceeded! {budget.category.value} category has reached {percentage:.1f}% (₹{budget.current_spent:.2f} / ₹{budget.monthly_limit:.2f})"
-                alert = create_alert(
-                    db,
-                    user_id,
-                    AlertType.BUDGET_100_PERCENT,
-                    message,
-                    budget.id
-                )
-                generated_alerts.append(alert)
-        
-        # Check for 80% threshold
-        elif percentage >= 80:
-            # Check if alert already exists for this budget at 80%
-            existing_alert = db.query(Alert).filter(
-                Alert.budget_id == budget.id,
-                Alert.alert_type == AlertType.BUDGET_80_PERCENT,
-                Alert.is_read == 0
-            ).first()
-            
-            if not existing_alert:
-                message = f"Budget warning! {budget.category.value} category has reached {percentage:.1f}% (₹{budget.current_spent:.2f} / ₹{budget.monthly_limit:.2f})"
-                alert = create_alert(
-                    db,
-                    user_id,
-                    AlertType.BUDGET_80_PERCENT,
-                    message,
-                    budget.id
-                )
-                generated_alerts.append(alert)
-    
-    return generated_alerts
-
-
-def check_overall_balance_limit_alert(db: Session, user_id: int, total_balance: float) -> Optional[Alert]:
-    """Check overall balance limit and generate alert if exceeded"""
-    user = db.query(User).filter(User.id == user_id).first()
-    
-    if not user or not user.overall_balance_limit:
+def budget_alert_for(budget) -> Optional[Tuple[AlertType, str]]:
+    """Return the (alert_type, message) a budget currently warrants, if any"""
+    if budget.monthly_limit <= 0:
+        return None
+
+    percentage = (budget.current_spent / budget.monthly_limit) * 100
+
+    # Check for 100% threshold
+    if percentage >= 100:
+        return (
+            AlertType.BUDGET_100_PERCENT,
+            f"Budget exceeded! {budget.category.value} category has reached {percentage:.1f}% (₹{budget.current_spent:.2f} / ₹{budget.monthly_limit:.2f})"
+        )
+    # Check for 80% threshold
+    if percentage >= 80:
+        return (
+            AlertType.BUDGET_80_PERCENT,
+            f"Budget warning! {budget.category.value} category has reached {percentage:.1f}% (₹{budget.current_spent:.2f} / ₹{budget.monthly_limit:.2f})"
+        )
+    return None
+
+
+def check_budget_alert(db: Session, budget: Budget) -> Optional[Alert]:
+    """Generate an 80% or 100% alert for a single budget if one is not already unread"""
+    warranted = budget_alert_for(budget)
+    if not warranted:
         return None
-    
-    if total_balance > user.overall_balance_limit:
-        # Check if alert already exists
-        existing_alert = db.query(Alert).filter(
-            Alert.user_id == user_id,
-            Alert.alert_type == AlertType.OVERALL_BALANCE_LIMIT,
-            Alert.is_read == 0
-        ).first()
-        
-        if not existing_alert:
-            message = f"Overall balance limit exceeded! Current balance: ₹{total_balance:.2f}, Limit: ₹{user.overall_balance_limit:.2f}"
+    alert_type, message = warranted
+
+    # Indexed lookup on the unread dedup key
+    key = alert_dedup_key(alert_type, budget.user_id, budget.id)
+    if db.query(Alert.id).filter(Alert.dedup_key == key).first():
+        return None
+
+    # A concurrent writer may still win the race; the unique key rejects ours
+    try:
+        with db.begin_nested():
             return create_alert(
                 db,
-                user_id,
-                AlertType.OVERALL_BALANCE_LIMIT,
-                message
+                budget.user_id,
+                alert_type,
+                message,
+                budget.id
             )
-    
-    return None
+    except IntegrityError:
+        return None
+
+
+def generate_alerts_bulk(db: Session) -> int:
+    """Set-based alert evaluation across every user.
+
+    Loads the budgets over a threshold, the users over their overall balance
+    limit and the keys of all unread alerts, diffs them in memory and
+    bulk-inserts only the missing alerts. Returns the number inserted.
+    """
+    # Query 1: budgets at or above 80% of their limit
+    budgets = db.execute(
+        select(Budget.id, Budget.user_id, Budget.category, Budget.monthly_limit, Budget.current_spent)
+        .where(Budget.monthly_limit > 0, Budget.current_spent >= Budget.monthly_limit * 0.8)
+    ).all()
+
+    # Query 2: users whose combined balance exceeds their overall limit
+    total_balance = func.sum(RegisteredUser.account_balance)
+    over_limit = db.execute(
+        select(User.id, User.overall_balance_limit, total_balance.label("total_balance"))
+        .join(RegisteredUser, RegisteredUser.user_id == User.id)
+        .where(User.overall_balance_limit.isnot(None), User.overall_balance_limit > 0)
+        .group_by(User.id, User.overall_balance_limit)
+        .having(total_balance > User.overall_balance_limit)
+    ).all()
+
+    # Query 3: every unread alert key
+    existing_keys = set(db.execute(
+        select(Alert.dedup_key).where(Alert.is_read == 0, Alert.dedup_key.isnot(None))
+    ).scalars())
+
+    rows = []
+    for budget in budgets:
+        warranted = budget_alert_for(budget)
+        if not warranted:
+            continue
+        alert_type, message = warranted
+        key = alert_dedup_key(alert_type, budget.user_id, budget.id)
+        if key in existing_keys:
+            continue
+        existing_keys.add(key)
+        rows.append({
+            "user_id": budget.user_id,
+            "budget_id": budget.id,
+            "alert_type": alert_type,
+            "message": message,
+            "dedup_key": key
+        })
+
+    for user_id, limit, balance in over_limit:
+        key = alert_dedup_key(AlertType.OVERALL_BALANCE_LIMIT, user_id)
+        if key in existing_keys:
+            continue
+        existing_keys.add(key)
+        rows.append({
+            "user_id": user_id,
+            "budget_id": None,
+            "alert_type": AlertType.OVERALL_BALANCE_LIMIT,
+            "message": f"Overall balance limit exceeded! Current balance: ₹{balance:.2f}, Limit: ₹{limit:.2f}",
+            "dedup_key": key
+        })
 
+    return insert_alerts_ignoring_duplicates(db, rows)
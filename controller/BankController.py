@@ -2,13 +2,18 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from schema.models import Bank
+from services.cache import invalidate_on_commit
+from services.connectors import CONNECTORS
 
 
-def create_bank(db: Session, bank_name: str) -> Bank:
-    bank = Bank(bank_name=bank_name)
+def create_bank(db: Session, bank_name: str, connector_type: str = "http", connector_config: Optional[dict] = None) -> Bank:
+    if connector_type not in CONNECTORS:
+        raise ValueError(f"Unknown connector type: {connector_type}")
+    bank = Bank(bank_name=bank_name, connector_type=connector_type, connector_config=connector_config)
     db.add(bank)
     db.flush()
     db.refresh(bank)
+    invalidate_on_commit(db, "banks")
     return bank
 
 
@@ -1,5 +1,7 @@
 # controller/BudgetController.py
 from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from schema.models import Budget, TransactionCategory
 
@@ -30,6 +32,10 @@ def get_budgets_by_user(db: Session, user_id: int) -> List[Budget]:
     return db.query(Budget).filter(Budget.user_id == user_id).all()
 
 
+async def get_budgets_by_user_async(db: AsyncSession, user_id: int) -> List[Budget]:
+    return (await db.execute(select(Budget).where(Budget.user_id == user_id))).scalars().all()
+
+
 def update_budget_spent(db: Session, budget_id: int, amount: float) -> Optional[Budget]:
     budget = db.query(Budget).filter(Budget.id == budget_id).first()
     if not budget:
@@ -40,6 +46,29 @@ def update_budget_spent(db: Session, budget_id: int, amount: float) -> Optional[
     return budget
 
 
+def increment_budget_spent(
+    db: Session,
+    user_id: int,
+    category: TransactionCategory,
+    amount: float
+) -> Optional[Budget]:
+    """Atomically add `amount` to the user's budget for `category` inside the caller's transaction"""
+    result = db.execute(
+        update(Budget)
+        .where(Budget.user_id == user_id, Budget.category == category)
+        .values(current_spent=Budget.current_spent + amount)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return None
+    return (
+        db.query(Budget)
+        .filter(Budget.user_id == user_id, Budget.category == category)
+        .populate_existing()
+        .first()
+    )
+
+
 def reset_monthly_budget(db: Session, budget_id: int) -> Optional[Budget]:
     budget = db.query(Budget).filter(Budget.id == budget_id).first()
     if budget:
@@ -1,7 +1,9 @@
 # controller/RegisteredAccountController.py
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from schema.models import RegisteredUser
+from schema.models import RegisteredUser, User
 
 
 def create_registered_account(
@@ -13,13 +15,15 @@ def create_registered_account(
     bank_id: int,
     account_balance: float = 0.0
 ) -> RegisteredUser:
+    owner_id = db.query(User.id).filter(User.email == email).scalar()
     reg = RegisteredUser(
         account_number=account_number,
         ifsc_code=ifsc_code,
         phone_no=phone_no,
         email=email,
         bank_id=bank_id,
-        account_balance=account_balance
+        account_balance=account_balance,
+        user_id=owner_id
     )
     db.add(reg)
     db.flush()
@@ -32,8 +36,20 @@ def get_registered_account_by_number(db: Session, account_number: str) -> Option
     return db.query(RegisteredUser).filter(RegisteredUser.account_number == account_number).first()
 
 
+def get_registered_account_by_id(db: Session, account_id: int) -> Optional[RegisteredUser]:
+    return db.query(RegisteredUser).filter(RegisteredUser.id == account_id).first()
+
+
 def get_registered_account_by_bank(db: Session, bank_id: int) -> Optional[RegisteredUser]:
     return db.query(RegisteredUser).filter(RegisteredUser.bank_id == bank_id).first()
 
-def get_all_registered_accounts(db: Session) -> list[RegisteredUser]:
-    return db.query(RegisteredUser).all()  
\ No newline at end of file
+def get_all_registered_accounts(db: Session, columns: Optional[list] = None) -> list:
+    """All accounts as ORM objects, or as Rows of just `columns` when given"""
+    if columns:
+        return db.execute(select(*columns)).all()
+    return db.query(RegisteredUser).all()
+
+
+async def get_registered_accounts_by_user_async(db: AsyncSession, user_id: int) -> List[RegisteredUser]:
+    """The user's accounts, through the index on registered_users.user_id"""
+    return (await db.execute(select(RegisteredUser).where(RegisteredUser.user_id == user_id))).scalars().all()
@@ -1,8 +1,15 @@
 # controller/TransactionController.py
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict
 from datetime import datetime
+from sqlalchemy import select, or_, insert, update, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from schema.models import Transaction, TransactionType, TransactionCategory, RegisteredUser
+from controller.BudgetController import increment_budget_spent
+from controller.AlertController import check_budget_alert
+from controller.pagination import encode_cursor, decode_cursor
+from services.dedup import generate_transaction_hash, find_existing_hashes
 
 
 def create_transaction(
@@ -16,8 +23,17 @@ def create_transaction(
     transaction_date: Optional[datetime] = None
 ) -> Transaction:
 
+    # Only a caller-supplied date identifies a transaction well enough to dedup on
+    dedup_hash = None
     if transaction_date is None:
         transaction_date = datetime.utcnow()
+    else:
+        dedup_hash = generate_transaction_hash({
+            'from_account_id': from_account_id,
+            'amount': amount,
+            'transaction_date': transaction_date,
+            'transaction_type': transaction_type
+        })
 
     # Fetch user accounts correctly using `id`
     from_account = db.query(RegisteredUser).filter(RegisteredUser.id == from_account_id).first()
@@ -34,7 +50,7 @@ def create_transaction(
         raise ValueError("Receiver account not found")
 
     # Update balances
-    from_account.account_balance -= amount
+    from_account.account_balance += balance_delta(transaction_type, amount)
 
     if to_account:
         to_account.account_balance += amount
@@ -47,18 +63,22 @@ def create_transaction(
         amount=amount,
         category=category,
         transaction_date=transaction_date,
-        balance_after_transaction=from_account.account_balance
+        balance_after_transaction=from_account.account_balance,
+        dedup_hash=dedup_hash
     )
 
     db.add(tx)
+    # Flush now so a duplicate dedup_hash fails before any budget work
+    db.flush()
     
     # Update budget spent if it's a DEBIT transaction
     if transaction_type == TransactionType.DEBIT:
-        from controller.BudgetController import get_budgets_by_user
-        # Get user_id from account email (assuming email matches user email)
-        # In a real scenario, you'd have a proper relationship
-        # For now, we'll update budgets after transaction is created
-        # This will be handled by the sync service
+        # Bump the matching budget in this same transaction so thresholds are
+        # evaluated immediately; the scheduled recompute only reconciles drift
+        if from_account.user_id is not None:
+            budget = increment_budget_spent(db, from_account.user_id, category, amount)
+            if budget:
+                check_budget_alert(db, budget)
     
     db.commit()
     db.refresh(tx)
@@ -67,21 +87,277 @@ def create_transaction(
 
 
 
+def balance_delta(transaction_type: TransactionType, amount: float) -> float:
+    """Change to the from-account's balance: a CREDIT adds, anything else subtracts"""
+    return amount if transaction_type == TransactionType.CREDIT else -amount
+
+
+def apply_transaction_batch(db: Session, rows: List[dict]) -> List[dict]:
+    """Validate and write a batch of transactions inside the caller's DB transaction.
+
+    Same semantics as create_transaction applied row by row, but with one
+    account SELECT for the whole batch, one multi-row INSERT, one executemany
+    balance UPDATE carrying each account's net delta, and one budget bump per
+    (user, category). Rows whose dedup hash is already stored, or repeated
+    earlier in the batch, are reported as duplicates with one IN query.
+    As in create_transaction, rows without a transaction_date are not hashed.
+    Returns a result dict per input row, in order.
+    """
+    now = datetime.utcnow()
+    hashes = []
+    for row in rows:
+        if row.get("dedup_hash"):
+            hashes.append(row["dedup_hash"])
+        elif row.get("transaction_date"):
+            hashes.append(generate_transaction_hash(row))
+        else:
+            hashes.append(None)
+    existing_hashes = find_existing_hashes(db, [value for value in hashes if value])
+
+    account_ids = {row["from_account_id"] for row in rows}
+    account_ids |= {row["to_account_id"] for row in rows if row.get("to_account_id") is not None}
+
+    accounts = {
+        acc.id: acc for acc in
+        db.query(RegisteredUser.id, RegisteredUser.account_balance, RegisteredUser.user_id)
+        .filter(RegisteredUser.id.in_(account_ids))
+        .with_for_update()
+    }
+
+    balances: Dict[int, float] = {acc_id: acc.account_balance for acc_id, acc in accounts.items()}
+    deltas: Dict[int, float] = {}
+    budget_deltas: Dict[Tuple[int, TransactionCategory], float] = {}
+    results = []
+    to_insert = []
+    seen_hashes = set()
+
+    for index, row in enumerate(rows):
+        from_account_id = row["from_account_id"]
+        to_account_id = row.get("to_account_id")
+        amount = row["amount"]
+        dedup_hash = hashes[index]
+
+        if dedup_hash and (dedup_hash in existing_hashes or dedup_hash in seen_hashes):
+            results.append({"index": index, "status": "duplicate"})
+            continue
+
+        # Validate existence
+        if from_account_id not in accounts:
+            results.append({"index": index, "status": "error", "error": "Sender account not found"})
+            continue
+        if to_account_id and to_account_id not in accounts:
+            results.append({"index": index, "status": "error", "error": "Receiver account not found"})
+            continue
+
+        # Update balances
+        delta = balance_delta(row["transaction_type"], amount)
+        balances[from_account_id] += delta
+        deltas[from_account_id] = deltas.get(from_account_id, 0.0) + delta
+        if to_account_id:
+            balances[to_account_id] += amount
+            deltas[to_account_id] = deltas.get(to_account_id, 0.0) + amount
+
+        to_insert.append({
+            "from_account_id": from_account_id,
+            "to_account_id": to_account_id,
+            "transaction_type": row["transaction_type"],
+            "amount": amount,
+            "category": row["category"],
+            # Undated rows are stamped here, not on `row`: a row-by-row retry must still see them undated
+            "transaction_date": row.get("transaction_date") or now,
+            "balance_after_transaction": balances[from_account_id],
+            "dedup_hash": dedup_hash
+        })
+        seen_hashes.add(dedup_hash)
+        results.append({"index": index, "status": "created", "id": None})
+
+        owner_id = accounts[from_account_id].user_id
+        if row["transaction_type"] == TransactionType.DEBIT and owner_id is not None:
+            key = (owner_id, row["category"])
+            budget_deltas[key] = budget_deltas.get(key, 0.0) + amount
+
+    if not to_insert:
+        return results
+
+    new_ids = iter(_insert_transactions(db, to_insert))
+    for result in results:
+        if result["status"] == "created":
+            result["id"] = next(new_ids)
+
+    # One net delta per account
+    db.connection().execute(
+        update(RegisteredUser.__table__)
+        .where(RegisteredUser.__table__.c.id == bindparam("account_id"))
+        .values(account_balance=RegisteredUser.__table__.c.account_balance + bindparam("delta")),
+        [{"account_id": acc_id, "delta": delta} for acc_id, delta in deltas.items()]
+    )
+
+    for (user_id, category), amount in budget_deltas.items():
+        budget = increment_budget_spent(db, user_id, category, amount)
+        if budget:
+            check_budget_alert(db, budget)
+
+    return results
+
+
+def _insert_transactions(db: Session, rows: List[dict]) -> List[int]:
+    """Insert `rows` and return their new ids, in order"""
+    stmt = insert(Transaction)
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        # One multi-row INSERT ... RETURNING
+        return db.execute(stmt.returning(Transaction.id, sort_by_parameter_order=True), rows).scalars().all()
+
+    # No ordered RETURNING (MySQL): hashed rows go in one executemany and their
+    # ids are read back by the unique dedup_hash; unhashed rows go one by one
+    hashed = [row for row in rows if row["dedup_hash"]]
+    ids_by_hash = {}
+    if hashed:
+        db.execute(stmt, hashed)
+        hashes = [row["dedup_hash"] for row in hashed]
+        for start in range(0, len(hashes), 1000):
+            ids_by_hash.update(
+                db.query(Transaction.dedup_hash, Transaction.id)
+                .filter(Transaction.dedup_hash.in_(hashes[start:start + 1000]))
+                .all()
+            )
+    return [
+        ids_by_hash[row["dedup_hash"]] if row["dedup_hash"]
+        else db.connection().execute(insert(Transaction.__table__), row).inserted_primary_key[0]
+        for row in rows
+    ]
+
+
+def create_transactions_bulk(db: Session, rows: List[dict], chunk_size: int = 1000) -> List[dict]:
+    """Apply `rows` in chunks, committing each chunk as its own transaction.
+
+    A chunk that fails is rolled back and retried row by row, so only the
+    rows that fail on their own are reported as errors.
+    """
+    results = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            chunk_results = apply_transaction_batch(db, chunk)
+            db.commit()
+        except Exception:
+            db.rollback()
+            chunk_results = _apply_rows_one_by_one(db, chunk)
+        for result in chunk_results:
+            result["index"] += start
+        results.extend(chunk_results)
+    return results
+
+
+def _apply_rows_one_by_one(db: Session, rows: List[dict]) -> List[dict]:
+    results = []
+    for index, row in enumerate(rows):
+        try:
+            result = apply_transaction_batch(db, [row])[0]
+            db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent insert of the same transaction
+            db.rollback()
+            result = {"status": "duplicate"}
+        except Exception as e:
+            db.rollback()
+            result = {"status": "error", "error": str(e)}
+        result["index"] = index
+        results.append(result)
+    return results
+
+
 def get_transaction_by_id(db: Session, tx_id: int) -> Optional[Transaction]:
     return db.query(Transaction).filter(Transaction.id == tx_id).first()
 
 
+def transactions_by_account_query(account_id: int, limit: int = 50, skip: int = 0, columns: Optional[list] = None):
+    return (
+        (select(*columns) if columns else select(Transaction))
+        .where(Transaction.from_account_id == account_id)
+        .order_by(Transaction.transaction_date.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
 def get_transactions_by_account(
     db: Session,
     account_id: int,
     limit: int = 50,
     skip: int = 0
 ) -> List[Transaction]:
+    return db.execute(transactions_by_account_query(account_id, limit, skip)).scalars().all()
+
+
+async def get_transactions_by_account_async(
+    db: AsyncSession,
+    account_id: int,
+    limit: int = 50,
+    skip: int = 0,
+    columns: Optional[list] = None
+) -> List[Transaction]:
+    """The account's transactions, newest first; Rows of just `columns` when given"""
+    result = await db.execute(transactions_by_account_query(account_id, limit, skip, columns))
+    return result.all() if columns else result.scalars().all()
+
+
+def transactions_page_query(account_id: int, limit: int = 50, cursor: Optional[str] = None,
+                            columns: Optional[list] = None):
+    """Keyset page query: seeks on (transaction_date, id) through ix_transactions_from_account_date.
+
+    Fetches one row more than `limit` to tell whether another page follows.
+    Selects `columns` (which must include transaction_date and id) instead of
+    whole Transactions when given. Raises ValueError for a malformed cursor.
+    """
+    query = (select(*columns) if columns else select(Transaction)).where(Transaction.from_account_id == account_id)
+
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        # The redundant `<=` bound gives the planner an index range to seek on
+        query = query.where(
+            Transaction.transaction_date <= last_date,
+            or_(
+                Transaction.transaction_date < last_date,
+                Transaction.id < last_id
+            )
+        )
+
     return (
-        db.query(Transaction)
-        .filter(Transaction.from_account_id == account_id)
-        .order_by(Transaction.transaction_date.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
\ No newline at end of file
+        query
+        .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def _split_page(rows: List[Transaction], limit: int) -> Tuple[List[Transaction], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].transaction_date, rows[-1].id)
+    return rows, next_cursor
+
+
+def get_transactions_page(
+    db: Session,
+    account_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[Transaction], Optional[str]]:
+    """Keyset-paginated transactions, newest first.
+
+    Every page costs the same no matter how deep it is. Returns the page
+    and the cursor for the next one (None on the last page).
+    """
+    rows = db.execute(transactions_page_query(account_id, limit, cursor)).scalars().all()
+    return _split_page(rows, limit)
+
+
+async def get_transactions_page_async(
+    db: AsyncSession,
+    account_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    columns: Optional[list] = None
+) -> Tuple[List[Transaction], Optional[str]]:
+    result = await db.execute(transactions_page_query(account_id, limit, cursor, columns))
+    return _split_page(result.all() if columns else result.scalars().all(), limit)
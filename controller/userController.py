@@ -1,7 +1,9 @@
 # controller/UserController.py
 from typing import Optional, Dict, Any
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from schema.models import User
+from schema.models import User, RegisteredUser, Budget
+from services.cache import invalidate_on_commit
 from datetime import datetime
 import hashlib
 
@@ -18,6 +20,11 @@ def create_user(
     db.add(user)
     db.flush()
     db.refresh(user)
+    # Claim accounts registered under this email before the user signed up
+    db.query(RegisteredUser).filter(
+        RegisteredUser.email == email,
+        RegisteredUser.user_id.is_(None)
+    ).update({"user_id": user.id}, synchronize_session=False)
     return user
 
 
@@ -43,6 +50,7 @@ def update_user(db: Session, user_id: int, update_data: Dict[str, Any]) -> Optio
     user.updated_at = datetime.utcnow()
     db.flush()
     db.refresh(user)
+    invalidate_on_commit(db, "balance_limit", user_id)
     return user
 
 
@@ -50,8 +58,60 @@ def delete_user(db: Session, user_id: int) -> bool:
     user = db.query(User).filter(User.id == user_id).first()
     if user:
         db.delete(user)
+        invalidate_on_commit(db, "balance_limit", user_id)
         return True
     return False
 
-def get_all_users(db: Session) -> list[User]:
-    return db.query(User).all()
\ No newline at end of file
+def get_all_users(db: Session, columns: Optional[list] = None) -> list:
+    """All users as ORM objects, or as Rows of just `columns` when given"""
+    if columns:
+        return db.execute(select(*columns)).all()
+    return db.query(User).all()
+
+
+def get_user_summary(db: Session, user_id: int) -> Optional[Dict[str, Any]]:
+    """Dashboard figures for one user, each from a query on an indexed user_id.
+
+    Returns the user's accounts, total balance, overall balance limit, budget
+    utilisation and unread alert count, or None if the user doesn't exist.
+    """
+    user = (
+        db.query(User.id, User.overall_balance_limit, User.unread_alert_count)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not user:
+        return None
+
+    accounts = (
+        db.query(
+            RegisteredUser.id, RegisteredUser.account_number, RegisteredUser.bank_id,
+            RegisteredUser.account_balance
+        )
+        .filter(RegisteredUser.user_id == user_id)
+        .order_by(RegisteredUser.id)
+        .all()
+    )
+    budgets = (
+        db.query(Budget.id, Budget.category, Budget.monthly_limit, Budget.current_spent)
+        .filter(Budget.user_id == user_id)
+        .order_by(Budget.id)
+        .all()
+    )
+    total_balance = sum(account.account_balance for account in accounts)
+    limit = user.overall_balance_limit
+    return {
+        "user_id": user.id,
+        "accounts": [account._asdict() for account in accounts],
+        "total_balance": total_balance,
+        "overall_balance_limit": limit,
+        "balance_limit_percentage": round(total_balance / limit * 100, 1) if limit else None,
+        "budgets": [
+            {
+                **budget._asdict(),
+                "percentage": round(budget.current_spent / budget.monthly_limit * 100, 1) if budget.monthly_limit else None,
+            }
+            for budget in budgets
+        ],
+        "unread_alert_count": user.unread_alert_count,
+    }
@@ -1,7 +1,13 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 import os
 from dotenv import load_dotenv
+from db.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, install_pool_metrics
+from db.sql_log import install_sampled_sql_logger
+from db.query_stats import install_query_stats
+from db.slow_query_log import install_slow_query_log
+from db.routing import RoutingSession, ReplicaHealth, install_write_tracking
 
 # Load environment variables
 load_dotenv()
@@ -21,16 +27,139 @@ else:
 
 print(f"Connection URL: mysql+pymysql://***@{DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'localhost'}")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# Pool sizing: size it to the worker count, e.g. (workers x threads) <= pool_size + max_overflow
+# and below the server's max_connections. See GET /metrics/pool for checkout waits.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle before the server's wait_timeout (or a proxy's idle timeout) drops idle connections
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Fraction of statements to log at DEBUG; replaces echo=True (0 = off)
+SQL_LOG_SAMPLE_RATE = float(os.getenv("SQL_LOG_SAMPLE_RATE", "0"))
+# Log statements slower than this many ms, with their EXPLAIN, as JSON lines (0 = off)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "slow_queries.log")
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", "10000000"))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+# EXPLAIN each distinct slow statement at most once per this many seconds
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300"))
+
+# Optional read replica for GET handlers and read-only sync stages; unset = everything on the primary
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+if REPLICA_DATABASE_URL and REPLICA_DATABASE_URL.startswith("mysql://"):
+    REPLICA_DATABASE_URL = REPLICA_DATABASE_URL.replace("mysql://", "mysql+pymysql://", 1)
+# Skip the replica while it lags more than this many seconds (unset = no lag check)
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS")) if os.getenv("REPLICA_MAX_LAG_SECONDS") else None
+# After a client writes, its reads stay on the primary this long (at least the tolerated lag)
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", str(max(REPLICA_MAX_LAG_SECONDS or 0, 5))))
+
+
+def instrument(engine):
+    """Attach pool metrics, the sampled SQL log, per-request query stats and the slow query log to `engine`"""
+    install_pool_metrics(engine)
+    install_sampled_sql_logger(engine, SQL_LOG_SAMPLE_RATE)
+    install_query_stats(engine)
+    install_slow_query_log(
+        engine, SLOW_QUERY_MS, SLOW_QUERY_LOG_FILE, SLOW_QUERY_LOG_MAX_BYTES,
+        SLOW_QUERY_LOG_BACKUPS, SLOW_QUERY_EXPLAIN_INTERVAL
+    )
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.split("://", 1)[1] in ("", "/:memory:") if url.startswith("sqlite") else False
+
+
+def pool_options(url: str, poolclass) -> dict:
+    """Pool settings for `url`; in-memory SQLite keeps SQLAlchemy's single-connection pool"""
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, InstrumentedQueuePool))
+instrument(engine)
 
 class Base(DeclarativeBase):
     pass
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Async engine on the same database, for async route handlers:
+# aiomysql for MySQL, aiosqlite for local SQLite
+ASYNC_DRIVERS = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def async_url(url: str) -> str:
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return url.replace(sync_prefix, async_prefix, 1)
+    return url
+
+
+ASYNC_DATABASE_URL = async_url(DATABASE_URL)
+
+# Same pool settings; also keeps aiosqlite off its default NullPool (a new connection and thread per session)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool))
+instrument(async_engine)
+
+# expire_on_commit=False: objects stay readable after commit without an implicit (sync) refresh
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Read sessions: SELECTs go to the replica (when configured and not lagging), writes and
+# any read after a write in the same session go to the primary. Across requests,
+# ReadYourWritesMiddleware keeps a client that just wrote on the primary for REPLICA_PIN_SECONDS
+replica_engine = None
+async_replica_engine = None
+replica_health = None
+if REPLICA_DATABASE_URL:
+    print(f"📖 Read replica: ***@{REPLICA_DATABASE_URL.split('@')[1] if '@' in REPLICA_DATABASE_URL else REPLICA_DATABASE_URL}")
+    replica_engine = create_engine(REPLICA_DATABASE_URL, **pool_options(REPLICA_DATABASE_URL, InstrumentedQueuePool))
+    instrument(replica_engine)
+    async_replica_url = async_url(REPLICA_DATABASE_URL)
+    async_replica_engine = create_async_engine(async_replica_url, **pool_options(async_replica_url, InstrumentedAsyncQueuePool))
+    instrument(async_replica_engine)
+    replica_health = ReplicaHealth(replica_engine, REPLICA_MAX_LAG_SECONDS)
+    install_write_tracking(engine)
+    install_write_tracking(async_engine)
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, bind=engine, autoflush=False, autocommit=False,
+    replica_bind=replica_engine, replica_health=replica_health, info={"use_replica": True}
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False,
+    replica_bind=async_replica_engine, replica_health=replica_health, info={"use_replica": True}
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,41 @@
+# db/lean_query.py
+"""
+Lean read path for large list responses.
+
+Instead of loading ORM objects (identity map, attribute instrumentation,
+relationship loaders) and validating each one through a Pydantic
+response_model, a lean read selects only the columns the response model
+declares and encodes the Row tuples straight to JSON with orjson.
+
+Only use it where the columns already have the response fields' types:
+nothing is coerced or validated on the way out. Routes keep their
+response_model for the OpenAPI schema; returning a Response bypasses it.
+"""
+
+from typing import Iterable, List, Optional
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def response_columns(entity, response_model: type[BaseModel]) -> list:
+    """`entity`'s columns named by `response_model`'s fields, in field order"""
+    return [getattr(entity, name) for name in response_model.model_fields]
+
+
+def rows_as_dicts(rows: Iterable) -> List[dict]:
+    rows = list(rows)
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def lean_response(rows: Iterable) -> ORJSONResponse:
+    """JSON array response for a list of Rows"""
+    return ORJSONResponse(rows_as_dicts(rows))
+
+
+def lean_page_response(rows: Iterable, next_cursor: Optional[str]) -> ORJSONResponse:
+    """{"items": [...], "next_cursor": ...} response for a page of Rows"""
+    return ORJSONResponse({"items": rows_as_dicts(rows), "next_cursor": next_cursor})
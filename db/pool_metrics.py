@@ -0,0 +1,159 @@
+# db/pool_metrics.py
+"""
+Connection pool instrumentation.
+
+InstrumentedQueuePool / InstrumentedAsyncQueuePool are drop-in pool classes
+that time each checkout through the public connect() (wait, including
+pre-ping, and timeouts). install_pool_metrics() adds listeners for the pool's
+checkout, checkin and connect events, which count those and sample how old
+each checked-out connection was. snapshot() combines the counters with the
+pool's public gauges (size, checked out, overflow, status) for the
+/metrics/pool endpoint.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+SAMPLE_SIZE = 1000
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self._waits = deque(maxlen=SAMPLE_SIZE)
+        self._ages = deque(maxlen=SAMPLE_SIZE)
+
+    def record_wait(self, waited: float):
+        with self._lock:
+            self.wait_seconds_total += waited
+            self._waits.append(waited)
+
+    def record_checkout(self, connection_age: float):
+        with self._lock:
+            self.checkouts += 1
+            self._ages.append(connection_age)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_timeout(self, waited: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += waited
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            ages = sorted(self._ages)
+            counters = {
+                "checkouts_total": self.checkouts,
+                "checkins_total": self.checkins,
+                "connections_created_total": self.connects,
+                "checkout_timeouts_total": self.timeouts,
+                "checkout_wait_seconds_total": round(self.wait_seconds_total, 6),
+            }
+        return {
+            "pool_class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # Negative while the pool hasn't filled up to pool_size yet
+            "overflow": pool.overflow(),
+            "status": pool.status(),
+            **counters,
+            "checkout_wait_ms": {
+                "p50": round(_percentile(waits, 0.5) * 1000, 3),
+                "p99": round(_percentile(waits, 0.99) * 1000, 3),
+                "max": round(waits[-1] * 1000, 3) if waits else 0.0,
+            },
+            "connection_age_seconds": {
+                "p50": round(_percentile(ages, 0.5), 1),
+                "max": round(ages[-1], 1) if ages else 0.0,
+            },
+            "samples": len(waits),
+        }
+
+
+class _InstrumentedPoolMixin:
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # recreate() (engine.dispose) builds a new pool; the metrics carry over
+        self.metrics = metrics or PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def install_pool_metrics(engine):
+    """Count `engine`'s checkouts, checkins and new connections (sync or async engine).
+
+    The listeners go on the pool; recreate() copies them to the replacement
+    pool. Engines on another pool class are left alone.
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, _InstrumentedPoolMixin):
+        return
+    metrics = pool.metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.time()
+        metrics.record_connect()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        now = time.time()
+        metrics.record_checkout(now - connection_record.info.get("connected_at", now))
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.record_checkin()
+
+
+def pool_snapshot(engine) -> Optional[dict]:
+    """Metrics for `engine`'s pool (sync or async engine); None if it isn't instrumented"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    metrics = getattr(pool, "metrics", None)
+    return metrics.snapshot(pool) if metrics is not None else None
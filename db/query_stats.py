@@ -0,0 +1,77 @@
+# db/query_stats.py
+"""
+Per-request SQL statement counts and DB time.
+
+The request metrics middleware opens a QueryStats for each request in a
+context variable. Cursor-execute hooks on the engines add every statement
+and its duration to whichever QueryStats is current. Handlers run in the
+threadpool or on the event loop (async engine), and both see the request's
+context. Statements from background work (scheduler, sync jobs) have no
+current QueryStats and are not counted.
+
+query_source() names background work (sync stages, scheduler ticks) for the
+slow query log. Statements inside a request are attributed to its method
+and route template instead.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+
+class QueryStats:
+    __slots__ = ("statements", "seconds", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.statements = 0
+        self.seconds = 0.0
+        # The request's ASGI scope; the router adds the matched route to it
+        self.scope = scope
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+current_query_source: ContextVar[Optional[str]] = ContextVar("current_query_source", default=None)
+
+
+@contextmanager
+def query_source(name: str):
+    """Attribute the statements run inside this block to `name` (e.g. "stage:sync_accounts")"""
+    token = current_query_source.set(name)
+    try:
+        yield
+    finally:
+        current_query_source.reset(token)
+
+
+def describe_query_source() -> str:
+    """Where the current statement comes from: a named source, a request's route, or unknown"""
+    source = current_query_source.get()
+    if source:
+        return source
+    stats = current_query_stats.get()
+    if stats is not None and stats.scope is not None:
+        route = getattr(stats.scope.get("route"), "path", None) or "unmatched"
+        return f"{stats.scope.get('method')} {route}"
+    return "unknown"
+
+
+def install_query_stats(engine):
+    """Count `engine`'s statements (sync or async engine) into the current QueryStats"""
+    engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if current_query_stats.get() is not None:
+            conn.info["query_stats_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_stats_started", None)
+        stats = current_query_stats.get()
+        if started is None or stats is None:
+            return
+        stats.statements += 1
+        stats.seconds += time.perf_counter() - started
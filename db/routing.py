@@ -0,0 +1,179 @@
+# db/routing.py
+"""
+Read/write routing between the primary database and a read replica.
+
+RoutingSession sends a statement to the replica only when the session was
+opened for reading (ReadSessionLocal / get_read_db), the statement is a
+plain SELECT, and the session hasn't written anything yet. Everything else,
+including every read after a write in the same session, goes to the
+primary. When a maximum lag is configured, a replica that falls too far
+behind (or can't report its lag) is skipped until it catches up.
+
+A session only knows about its own writes. Across requests (a POST, then a
+GET), ReadYourWritesMiddleware pins a client to the primary for a short
+window after any request of theirs wrote. The pin travels in a last_write
+cookie and an X-Last-Write header: the response to a write sets both, and a
+later request may send back either one.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaHealth:
+    """Caches whether the replica is within `max_lag_seconds` of the primary"""
+
+    def __init__(self, engine, max_lag_seconds: Optional[float] = None, check_interval: float = 5.0):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._usable = True
+        self.last_lag_seconds: Optional[float] = None
+
+    def _measure_lag(self) -> Optional[float]:
+        """Replication lag in seconds; None when the replica can't tell (replication stopped)"""
+        if self.engine.dialect.name != "mysql":
+            # Nothing to ask (e.g. a SQLite copy for local testing): treat as caught up
+            return 0.0
+        with self.engine.connect() as conn:
+            try:
+                row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+                column = "Seconds_Behind_Source"
+            except Exception:
+                # MySQL < 8.0.22
+                row = conn.execute(text("SHOW SLAVE STATUS")).mappings().first()
+                column = "Seconds_Behind_Master"
+        if row is None:
+            return None
+        lag = row.get(column)
+        return float(lag) if lag is not None else None
+
+    def is_usable(self) -> bool:
+        if self.max_lag_seconds is None:
+            return True
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._usable
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._usable
+            try:
+                lag = self._measure_lag()
+            except Exception as e:
+                logger.error(f"Replica lag check failed: {str(e)}")
+                lag = None
+            usable = lag is not None and lag <= self.max_lag_seconds
+            if usable != self._usable:
+                logger.warning(f"Replica {'back in use' if usable else 'skipped'} (lag: {lag})")
+            self.last_lag_seconds = lag
+            self._usable = usable
+            self._checked_at = now
+        return self._usable
+
+
+class RoutingSession(Session):
+    """Session that reads from `replica_bind` when opened with info={"use_replica": True}"""
+
+    def __init__(self, *args, replica_bind=None, replica_health: Optional[ReplicaHealth] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Async sessions hand over AsyncEngines; the sync session underneath needs their sync side
+        self.replica_bind = getattr(replica_bind, "sync_engine", replica_bind)
+        self.replica_health = replica_health
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.replica_bind is None or not self.info.get("use_replica"):
+            return primary
+        pin = request_pin.get()
+        if pin is not None and pin["pinned"]:
+            # This client wrote moments ago; the replica may not have it yet
+            return primary
+        if self._flushing or self.info.get("wrote") or isinstance(clause, UpdateBase) or self.new or self.dirty or self.deleted:
+            # Writes, and every read after a write, stay on the primary
+            self.info["wrote"] = True
+            return primary
+        if clause is not None and getattr(clause, "_for_update_arg", None) is not None:
+            return primary
+        if self.replica_health is not None and not self.replica_health.is_usable():
+            return primary
+        return self.replica_bind
+
+
+# Per-request {"pinned": bool, "wrote": bool}, set by ReadYourWritesMiddleware.
+# A mutable dict, so writes made in threadpool copies of the context still show.
+request_pin: ContextVar[Optional[dict]] = ContextVar("request_pin", default=None)
+
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = b"x-last-write"
+
+
+def install_write_tracking(engine):
+    """Flag the current request as having written when `engine` runs an INSERT, UPDATE or DELETE"""
+    engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _note_write(conn, cursor, statement, parameters, context, executemany):
+        pin = request_pin.get()
+        if pin is not None and context is not None and (context.isinsert or context.isupdate or context.isdelete):
+            pin["wrote"] = True
+
+
+class ReadYourWritesMiddleware:
+    """Sends a client's reads to the primary for `pin_seconds` after a request of theirs wrote"""
+
+    def __init__(self, app, pin_seconds: float):
+        self.app = app
+        self.pin_seconds = pin_seconds
+
+    def _last_write(self, scope) -> Optional[float]:
+        for name, value in scope.get("headers", ()):
+            try:
+                if name == LAST_WRITE_HEADER:
+                    return float(value)
+                if name == b"cookie":
+                    morsel = SimpleCookie(value.decode("latin-1")).get(LAST_WRITE_COOKIE)
+                    if morsel is not None:
+                        return float(morsel.value)
+            except ValueError:
+                continue
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        last_write = self._last_write(scope)
+        pin = {"pinned": last_write is not None and time.time() - last_write < self.pin_seconds, "wrote": False}
+        token = request_pin.set(pin)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and pin["wrote"]:
+                stamp = f"{time.time():.3f}".encode()
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={stamp.decode()}; Max-Age={math.ceil(self.pin_seconds)}; "
+                    f"Path=/; HttpOnly; SameSite=Lax"
+                ).encode()
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", ())) + [(b"set-cookie", cookie), (LAST_WRITE_HEADER, stamp)],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_pin.reset(token)
@@ -0,0 +1,128 @@
+# db/slow_query_log.py
+"""
+Opt-in slow query log with EXPLAIN capture.
+
+With SLOW_QUERY_MS > 0, every statement on the instrumented engines is
+timed. A statement that takes longer than that is written as one JSON line
+to a rotating file (SLOW_QUERY_LOG_FILE) with:
+- the normalized SQL (literals replaced by ?, IN lists collapsed)
+- the parameters' shape (names and types, never the values)
+- where it came from (route or sync stage, see db.query_stats)
+- the EXPLAIN output
+
+EXPLAIN runs on the same connection right after the slow statement, at most
+once per normalized statement every SLOW_QUERY_EXPLAIN_INTERVAL seconds.
+At 0, the default, no listener is installed.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+from db.query_stats import describe_query_source
+
+logger = logging.getLogger("slow_query")
+
+MAX_STATEMENT_CHARS = 4000
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_NAMED_PLACEHOLDER = re.compile(r"%\(\w+\)s|:\w+|%s")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, replace literals and placeholders with ?, and fold IN lists to (?...)"""
+    sql = " ".join(statement.split())
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _NAMED_PLACEHOLDER.sub("?", sql)[:MAX_STATEMENT_CHARS]
+
+
+def parameter_shape(parameters, executemany: bool):
+    """Names and types of the bound parameters, without their values"""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(conn, statement: str, parameters) -> list:
+    """The plan for `statement` as a list of rows; EXPLAIN doesn't run the statement"""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        columns = [column[0] for column in cursor.description or ()]
+        return [dict(zip(columns, [str(value) if value is not None else None for value in row])) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def install_slow_query_log(engine, threshold_ms: float, path: str, max_bytes: int = 10_000_000,
+                           backup_count: int = 5, explain_interval: float = 300.0):
+    """Log `engine`'s statements slower than `threshold_ms` (sync or async engine)"""
+    if threshold_ms <= 0:
+        return
+    engine = getattr(engine, "sync_engine", engine)
+    if not logger.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    threshold = threshold_ms / 1000
+    explained_at = {}
+    explained_lock = threading.Lock()
+
+    def should_explain(normalized: str) -> bool:
+        now = time.monotonic()
+        with explained_lock:
+            if len(explained_at) > 10_000:
+                explained_at.clear()
+            if now - explained_at.get(normalized, float("-inf")) < explain_interval:
+                return False
+            explained_at[normalized] = now
+            return True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold:
+            return
+
+        normalized = normalize_sql(statement)
+        record = {
+            "at": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "duration_ms": round(elapsed * 1000, 2),
+            "source": describe_query_source(),
+            "database": engine.url.render_as_string(hide_password=True).split("@")[-1],
+            "sql": normalized,
+            "params": parameter_shape(parameters, executemany),
+        }
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINABLE) and should_explain(normalized):
+            try:
+                record["explain"] = _explain(conn, statement, parameters)
+            except Exception as e:
+                record["explain_error"] = str(e)
+        logger.info(json.dumps(record, default=str))
@@ -0,0 +1,43 @@
+# db/sql_log.py
+"""
+Opt-in sampled SQL logging, replacing engine echo.
+
+echo=True wrote every statement to stdout synchronously. With
+SQL_LOG_SAMPLE_RATE > 0 (e.g. 0.01 for 1%), that fraction of statements is
+logged at DEBUG on the "sql" logger with its duration. At 0, the default,
+no event listener is installed and statements cost nothing extra.
+"""
+
+import logging
+import random
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger("sql")
+
+MAX_STATEMENT_CHARS = 2000
+
+
+def install_sampled_sql_logger(engine, sample_rate: float):
+    """Log `sample_rate` of `engine`'s statements (sync or async engine)"""
+    if sample_rate <= 0:
+        return
+    engine = getattr(engine, "sync_engine", engine)
+    logger.setLevel(logging.DEBUG)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if random.random() < sample_rate:
+            conn.info["sql_log_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("sql_log_started", None)
+        if started is None:
+            return
+        rows = len(parameters) if executemany else 1
+        logger.debug(
+            f"{(time.perf_counter() - started) * 1000:.2f} ms "
+            f"({rows} param set{'s' if rows != 1 else ''}): {' '.join(statement.split())[:MAX_STATEMENT_CHARS]}"
+        )
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a bank API, for exercising the sync pipeline.
+
+Serves a deterministic statement for any account with an injected response
+latency, so concurrent sync can be tested without a real bank:
+
+    GET /banks/{bank_id}/accounts/{account_number}/transactions
+
+The statement is a JSON array, or NDJSON when the client accepts it, sorted
+oldest first. ?since=<ISO date> returns only transactions from that date on.
+
+Run it, then point the app at it:
+    python mock_bank_server.py --port 9000 --latency-ms 250 --count 20
+    BANK_API_URL=http://localhost:9000 python server.py
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DESCRIPTIONS = [
+    "SWIGGY ORDER", "UBER TRIP", "APOLLO PHARMACY", "BIGBASKET GROCERY", "SALARY CREDIT",
+    "ZOMATO", "IRCTC TRAIN BOOKING", "ELECTRICITY BILL", "CAFE COFFEE DAY", "ATM WITHDRAWAL"
+]
+ROUTE = re.compile(r"^/banks/(\d+)/accounts/([^/]+)/transactions/?$")
+
+
+def build_statement(bank_id: str, account_number: str, count: int) -> list:
+    """Same account, same day -> same statement, so repeated syncs exercise dedup"""
+    rng = random.Random(f"{bank_id}:{account_number}")
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30)
+    balance = 100000.0
+    statement = []
+    offsets = sorted(rng.randrange(30 * 24 * 60) for _ in range(count))
+    for i, offset in enumerate(offsets):
+        description = rng.choice(DESCRIPTIONS)
+        credit = "SALARY" in description
+        amount = round(rng.uniform(50, 5000), 2)
+        balance += amount if credit else -amount
+        statement.append({
+            "external_id": f"{account_number}-{i:06d}",
+            "transaction_date": (start + timedelta(minutes=offset)).isoformat(),
+            "transaction_type": "CREDIT" if credit else "DEBIT",
+            "amount": amount,
+            "description": description,
+            "balance_after_transaction": round(balance, 2),
+        })
+    return statement
+
+
+def make_handler(latency_ms: float, count: int):
+    class BankHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            match = ROUTE.match(url.path)
+            if not match:
+                self.send_error(404)
+                return
+            time.sleep(latency_ms / 1000)
+            statement = build_statement(match.group(1), match.group(2), count)
+            since = parse_qs(url.query).get("since")
+            if since:
+                statement = [record for record in statement if record["transaction_date"] >= since[0]]
+            if "ndjson" in self.headers.get("Accept", ""):
+                content_type = "application/x-ndjson"
+                body = "".join(json.dumps(record) + "\n" for record in statement).encode()
+            else:
+                content_type = "application/json"
+                body = json.dumps(statement).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return BankHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in bank API with injected latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=250)
+    parser.add_argument("--count", type=int, default=20, help="transactions per account statement")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.latency_ms, args.count))
+    print(f"🏦 Mock bank listening on http://{args.host}:{args.port} (latency {args.latency_ms:.0f} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Redis, for exercising the shared cache and cross-process
+cache invalidation without a real server.
+
+Speaks enough of the Redis protocol (RESP2) for services/cache.py:
+PING, SELECT, GET, SET (EX/PX), DEL, EXISTS, SCAN (MATCH), FLUSHDB,
+PUBLISH, SUBSCRIBE and UNSUBSCRIBE. Anything else gets an error reply.
+Everything lives in memory and is lost on exit.
+
+Run it, then point the app at it:
+    python mock_redis_server.py --port 6380
+    CACHE_BACKEND=redis CACHE_REDIS_URL=redis://localhost:6380/0 python server.py
+or keep per-process caches and use it only to fan out invalidations:
+    CACHE_REDIS_URL=redis://localhost:6380/0 uvicorn server:app --workers 4
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Dict, Optional, Set, Tuple
+
+
+class MockRedis:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: list, writer: asyncio.StreamWriter, subscriptions: Set[bytes]):
+        command = args[0].upper()
+        if command == b"PING":
+            return "+PONG"
+        if command == b"SELECT":
+            return "+OK"
+        if command == b"GET":
+            return self._get(args[1])
+        if command == b"SET":
+            expires_at = None
+            options = [arg.upper() for arg in args[3::2]]
+            for option, amount in zip(options, args[4::2]):
+                if option == b"EX":
+                    expires_at = time.monotonic() + int(amount)
+                elif option == b"PX":
+                    expires_at = time.monotonic() + int(amount) / 1000
+            self.data[args[1]] = (args[2], expires_at)
+            return "+OK"
+        if command == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args[1:])
+        if command == b"EXISTS":
+            return sum(self._get(key) is not None for key in args[1:])
+        if command == b"SCAN":
+            # One pass over everything: cursor 0 in, cursor 0 out
+            pattern = b"*"
+            for option, value in zip(args[2::2], args[3::2]):
+                if option.upper() == b"MATCH":
+                    pattern = value
+            keys = [key for key in list(self.data) if fnmatch.fnmatchcase(key.decode(), pattern.decode())
+                    and self._get(key) is not None]
+            return [b"0", keys]
+        if command == b"FLUSHDB":
+            self.data.clear()
+            return "+OK"
+        if command == b"PUBLISH":
+            receivers = self.channels.get(args[1], set())
+            for receiver in list(receivers):
+                receiver.write(encode([b"message", args[1], args[2]]))
+            return len(receivers)
+        if command == b"SUBSCRIBE":
+            replies = []
+            for channel in args[1:]:
+                self.channels.setdefault(channel, set()).add(writer)
+                subscriptions.add(channel)
+                replies.append(encode([b"subscribe", channel, len(subscriptions)]))
+            return b"".join(replies)
+        if command == b"UNSUBSCRIBE":
+            replies = []
+            for channel in args[1:] or list(subscriptions):
+                self.channels.get(channel, set()).discard(writer)
+                subscriptions.discard(channel)
+                replies.append(encode([b"unsubscribe", channel, len(subscriptions)]))
+            return b"".join(replies)
+        return "-ERR unknown command '" + command.decode(errors="replace") + "'"
+
+
+def encode(value) -> bytes:
+    """RESP2 encoding; str values are preformatted simple strings or errors"""
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, str):
+        return value.encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if value is None:
+        return b"$-1\r\n"
+    return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[list]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, e.g. from telnet
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+def make_handler(store: MockRedis):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: Set[bytes] = set()
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                reply = store.execute(args, writer, subscriptions)
+                writer.write(reply if isinstance(reply, bytes) and args[0].upper() in (b"SUBSCRIBE", b"UNSUBSCRIBE")
+                             else encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                store.channels.get(channel, set()).discard(writer)
+            writer.close()
+    return handle
+
+
+async def serve(host: str, port: int):
+    server = await asyncio.start_server(make_handler(MockRedis()), host, port)
+    print(f"🧰 Mock Redis listening on redis://{host}:{port}/0")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Redis server for the cache")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
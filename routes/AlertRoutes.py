@@ -1,17 +1,26 @@
 # routes/AlertRoutes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_read_db, get_async_read_db
 from controller.AlertController import (
-    get_alerts_by_user, get_alert_by_id, mark_alert_as_read,
-    mark_all_alerts_as_read, delete_alert
+    get_alerts_by_user_async, get_alerts_page_async, get_unread_alert_count_async,
+    get_alert_by_id, mark_alert_as_read, mark_all_alerts_as_read, delete_alert
 )
 from schema.models import AlertType
+from services.alert_stream import broker, get_alerts_after
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
+import asyncio
 
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 
+# EventSource reconnect delay, and the comment line that keeps idle streams open through proxies
+STREAM_RETRY_MS = 5000
+STREAM_KEEPALIVE_SECONDS = 15
+
 class AlertResponse(BaseModel):
     id: int
     user_id: int
@@ -19,20 +28,110 @@ class AlertResponse(BaseModel):
     alert_type: AlertType
     message: str
     is_read: int
-    created_at: str
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
+class AlertPage(BaseModel):
+    items: List[AlertResponse]
+    next_cursor: Optional[str] = None
+
+class UnreadCountResponse(BaseModel):
+    user_id: int
+    unread_count: int
+
 
 @router.get("/user/{user_id}", response_model=List[AlertResponse])
-def get_user_alerts(user_id: int, unread_only: bool = False, db: Session = Depends(get_db)):
-    alerts = get_alerts_by_user(db, user_id, unread_only)
+async def get_user_alerts(
+    user_id: int,
+    unread_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """The user's alerts, newest first (all of them unless `limit` is given); /inbox pages through them"""
+    alerts = await get_alerts_by_user_async(db, user_id, unread_only, limit)
     return alerts
 
 
+@router.get("/user/{user_id}/inbox", response_model=AlertPage)
+async def get_user_inbox(
+    user_id: int,
+    unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """A page of the user's alerts, newest first; pass next_cursor back for the following page"""
+    try:
+        items, next_cursor = await get_alerts_page_async(db, user_id, limit, cursor, unread_only)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return AlertPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/user/{user_id}/unread-count", response_model=UnreadCountResponse)
+async def get_user_unread_count(user_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """The user's maintained unread counter; a single-row read"""
+    count = await get_unread_alert_count_async(db, user_id)
+    if count is None:
+        raise HTTPException(404, "User not found")
+    return {"user_id": user_id, "unread_count": count}
+
+
+def _alert_event(alert) -> str:
+    return f"id: {alert.id}\nevent: alert\ndata: {AlertResponse.model_validate(alert).model_dump_json()}\n\n"
+
+
+@router.get("/user/{user_id}/stream")
+async def stream_user_alerts(user_id: int, request: Request, last_event_id: Optional[int] = None):
+    """Server-sent events: an `alert` event (id = alert id) for each new alert of the user.
+
+    Resumes after the Last-Event-ID header that EventSource sends on
+    reconnect, or after `last_event_id` (e.g. the newest alert already shown)
+    on the first connect. New alerts come from the worker's AlertBroker, not
+    from a query per client.
+    """
+    header = request.headers.get("last-event-id", "")
+    resume_after = int(header) if header.isdigit() else last_event_id
+
+    async def events():
+        # Subscribe before the backfill so nothing committed in between is missed
+        queue = broker.subscribe(user_id)
+        # Ids, not a high-water mark: a late commit arrives with a lower id than ones already sent
+        sent = set()
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            if resume_after is not None:
+                for alert in await get_alerts_after(user_id, resume_after):
+                    yield _alert_event(alert)
+                    sent.add(alert.id)
+            while True:
+                try:
+                    alert = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                if alert is None:
+                    # Dropped for falling behind; the client reconnects and resumes
+                    break
+                if alert.id not in sent:
+                    yield _alert_event(alert)
+                    sent.add(alert.id)
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{alert_id}", response_model=AlertResponse)
-def get_alert(alert_id: int, db: Session = Depends(get_db)):
+def get_alert(alert_id: int, db: Session = Depends(get_read_db)):
     alert = get_alert_by_id(db, alert_id)
     if not alert:
         raise HTTPException(404, "Alert not found")
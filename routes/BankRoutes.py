@@ -4,16 +4,21 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from db.database import get_db
 from controller.BankController import create_bank, get_bank_by_id, get_all_banks
+from services.cache import cache
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter(prefix="/banks", tags=["Banks"])
 
 class BankCreate(BaseModel):
     bank_name: str
+    connector_type: str = "http"
+    connector_config: Optional[dict] = None
 
 class BankResponse(BaseModel):
     id: int
     bank_name: str
+    connector_type: str
 
     class Config:
         from_attributes = True
@@ -21,19 +26,28 @@ class BankResponse(BaseModel):
 
 @router.post("/", response_model=BankResponse, status_code=status.HTTP_201_CREATED)
 def add_bank(bank: BankCreate, db: Session = Depends(get_db)):
-    new_bank = create_bank(db, bank.bank_name)
+    try:
+        new_bank = create_bank(db, bank.bank_name, bank.connector_type, bank.connector_config)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     db.commit()
     return new_bank
 
 
+# Cache fills read the primary: the replica may still have the row an invalidation replaced
 @router.get("/", response_model=list[BankResponse])
 def list_banks(db: Session = Depends(get_db)):
-    return get_all_banks(db)
+    return cache.get_or_load(
+        "banks", "all",
+        lambda: [BankResponse.model_validate(bank).model_dump() for bank in get_all_banks(db)]
+    )
 
 
 @router.get("/{bank_id}", response_model=BankResponse)
 def get_bank(bank_id: int, db: Session = Depends(get_db)):
-    bank = get_bank_by_id(db, bank_id)
-    if not bank:
-        raise HTTPException(404, "Bank not found")
-    return bank
\ No newline at end of file
+    def load():
+        bank = get_bank_by_id(db, bank_id)
+        if not bank:
+            raise HTTPException(404, "Bank not found")
+        return BankResponse.model_validate(bank).model_dump()
+    return cache.get_or_load("banks", bank_id, load)
@@ -1,14 +1,18 @@
 # routes/BudgetRoutes.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_async_read_db
 from controller.BudgetController import (
-    create_budget, get_budgets_by_user, get_budget_by_id,
+    create_budget, get_budgets_by_user_async, get_budget_by_id,
     update_budget_spent, reset_monthly_budget
 )
-from schema.models import TransactionCategory
+from schema.models import TransactionCategory, SyncJobStatus
+from services.cache import cache
+from services.sync_jobs import enqueue_full_sync, get_sync_job
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
@@ -40,8 +44,9 @@ def set_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/user/{user_id}", response_model=List[BudgetResponse])
-def get_user_budgets(user_id: int, db: Session = Depends(get_db)):
-    return get_budgets_by_user(db, user_id)
+async def get_user_budgets(user_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    # Not cached: current_spent moves with every DEBIT
+    return await get_budgets_by_user_async(db, user_id)
 
 
 @router.post("/{budget_id}/reset")
@@ -67,19 +72,52 @@ def set_overall_balance_limit(limit_data: OverallBalanceLimitUpdate, db: Session
 
 @router.get("/overall-balance-limit/{user_id}")
 def get_overall_balance_limit(user_id: int, db: Session = Depends(get_db)):
+    # Cache fills read the primary: the replica may still have the row an invalidation replaced
     from controller.userController import get_user_by_id
-    user = get_user_by_id(db, user_id)
-    if not user:
-        raise HTTPException(404, "User not found")
-    return {"user_id": user.id, "overall_balance_limit": user.overall_balance_limit}
+
+    def load():
+        user = get_user_by_id(db, user_id)
+        if not user:
+            raise HTTPException(404, "User not found")
+        return {"user_id": user.id, "overall_balance_limit": user.overall_balance_limit}
+    return cache.get_or_load("balance_limit", user_id, load)
+
+
+class SyncTriggerResponse(BaseModel):
+    job_id: str
+    joined: bool
+    message: str
+
+class SyncJobResponse(BaseModel):
+    id: str
+    trigger: str
+    status: SyncJobStatus
+    current_stage: Optional[str] = None
+    stages: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 
-@router.post("/trigger-sync")
+@router.post("/trigger-sync", response_model=SyncTriggerResponse, status_code=status.HTTP_202_ACCEPTED)
 def trigger_manual_sync(db: Session = Depends(get_db)):
-    """Manually trigger sync workflow"""
-    from services.sync_service import full_sync_workflow
+    """Start the sync workflow in the background, or join the run already in flight"""
     try:
-        full_sync_workflow()
-        return {"message": "Sync completed successfully"}
+        job_id, joined = enqueue_full_sync(db, trigger="manual")
     except Exception as e:
-        raise HTTPException(500, f"Sync failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Sync failed to start: {str(e)}")
+    message = "Joined the sync already in progress" if joined else "Sync started"
+    return {"job_id": job_id, "joined": joined, "message": message}
+
+
+@router.get("/sync-jobs/{job_id}", response_model=SyncJobResponse)
+def get_sync_job_status(job_id: str, db: Session = Depends(get_db)):
+    """Status of a sync job, with progress per stage"""
+    job = get_sync_job(db, job_id)
+    if not job:
+        raise HTTPException(404, "Sync job not found")
+    return job
\ No newline at end of file
@@ -0,0 +1,46 @@
+# routes/MetricsRoutes.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from db.database import (
+    engine, async_engine, replica_engine, async_replica_engine, replica_health,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
+from db.pool_metrics import pool_snapshot
+from services.cache import cache
+from services.request_metrics import render_metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_request_metrics():
+    """Per-route latency, SQL statements, DB time and response size, Prometheus text format (per worker process)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/pool")
+def get_pool_metrics():
+    """Connection pool gauges, counters, checkout wait and connection age, per engine (per worker process)"""
+    return {
+        "config": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        },
+        "sync": pool_snapshot(engine),
+        "async": pool_snapshot(async_engine),
+        "replica": {
+            "sync": pool_snapshot(replica_engine),
+            "async": pool_snapshot(async_replica_engine),
+            "usable": replica_health.is_usable(),
+            "lag_seconds": replica_health.last_lag_seconds,
+        } if replica_engine is not None else None,
+    }
+
+
+@router.get("/cache")
+def get_cache_metrics():
+    """Reference data cache backend, size and hit/miss counters (per worker process)"""
+    return cache.stats()
@@ -1,11 +1,18 @@
 # routes/RegisteredAccountRoutes.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_read_db, get_async_read_db
+from db.lean_query import response_columns, lean_response
 from controller.RegisteredAccountController import (
-    create_registered_account, get_all_registered_accounts, get_registered_account_by_number
+    create_registered_account, get_all_registered_accounts, get_registered_account_by_number,
+    get_registered_accounts_by_user_async, get_registered_account_by_id
 )
+from schema.models import RegisteredUser
+from services.sync_service import bump_account_sync
 from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
 
 router = APIRouter(prefix="/registered-accounts", tags=["Registered Accounts"])
 
@@ -25,6 +32,17 @@ class RegisteredAccountResponse(BaseModel):
     email: str
     bank_id: int
     account_balance: float
+    user_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class SyncScheduleResponse(BaseModel):
+    account_id: int
+    next_sync_at: Optional[datetime] = None
+    sync_interval_seconds: Optional[int] = None
+    activity_rate: Optional[float] = None
+    last_synced_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -43,6 +61,21 @@ def register_account(account: RegisteredAccountCreate, db: Session = Depends(get
     return new_acc
 
 @router.get("/", response_model=list[RegisteredAccountResponse])
-def list_registered_accounts(db: Session = Depends(get_db)):
-    accounts = get_all_registered_accounts(db)
-    return accounts
\ No newline at end of file
+def list_registered_accounts(db: Session = Depends(get_read_db)):
+    accounts = get_all_registered_accounts(db, response_columns(RegisteredUser, RegisteredAccountResponse))
+    return lean_response(accounts)
+
+
+@router.get("/user/{user_id}", response_model=list[RegisteredAccountResponse])
+async def list_user_accounts(user_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    return await get_registered_accounts_by_user_async(db, user_id)
+
+
+@router.post("/{account_id}/sync", response_model=SyncScheduleResponse, status_code=status.HTTP_202_ACCEPTED)
+def bump_account_sync_route(account_id: int, db: Session = Depends(get_db)):
+    """Put the account at the front of the adaptive sync queue"""
+    if not get_registered_account_by_id(db, account_id):
+        raise HTTPException(404, "Account not found")
+    state = bump_account_sync(db, account_id)
+    db.commit()
+    return state
@@ -1,17 +1,24 @@
 # routes/TransactionRoutes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_async_read_db
+from db.lean_query import response_columns, lean_response, lean_page_response
 from controller.TransactionController import (
-    create_transaction, get_transaction_by_id, get_transactions_by_account
+    create_transaction, get_transaction_by_id, get_transactions_by_account_async,
+    get_transactions_page_async, create_transactions_bulk
 )
-from schema.models import TransactionType, TransactionCategory
+from schema.models import Transaction, TransactionType, TransactionCategory
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+# Largest list one request returns; longer histories are paged with /account/{id}/page
+MAX_PAGE_SIZE = 500
+
 class TransactionCreate(BaseModel):
     from_account_id: int
     transaction_type: TransactionType
@@ -21,6 +28,21 @@ class TransactionCreate(BaseModel):
     balance_after_transaction: float
     transaction_date: Optional[datetime] = None
 
+class TransactionBulkCreate(BaseModel):
+    transactions: List[TransactionCreate]
+
+class TransactionBulkResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class TransactionBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: List[TransactionBulkResult]
+
 class TransactionResponse(BaseModel):
     id: int
     from_account_id: int
@@ -33,29 +55,74 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
 
 @router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 def add_transaction(tx: TransactionCreate, db: Session = Depends(get_db)):
-    new_tx = create_transaction(
-        db=db,
-        from_account_id=tx.from_account_id,
-        transaction_type=tx.transaction_type,
-        to_account_id=tx.to_account_id,
-        amount=tx.amount,
-        category=tx.category,
-        balance_after_transaction=tx.balance_after_transaction,
-        transaction_date=tx.transaction_date
-    )
+    try:
+        new_tx = create_transaction(
+            db=db,
+            from_account_id=tx.from_account_id,
+            transaction_type=tx.transaction_type,
+            to_account_id=tx.to_account_id,
+            amount=tx.amount,
+            category=tx.category,
+            balance_after_transaction=tx.balance_after_transaction,
+            transaction_date=tx.transaction_date
+        )
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(409, "Duplicate transaction")
     db.commit()
     return new_tx
 
 
-@router.get("/account/{account_id}")
-def get_account_transactions(
+@router.post("/bulk", response_model=TransactionBulkResponse)
+def add_transactions_bulk(payload: TransactionBulkCreate, db: Session = Depends(get_db)):
+    """Import many transactions at once; each row gets its own result"""
+    results = create_transactions_bulk(db, [tx.model_dump() for tx in payload.transactions])
+    created = sum(1 for result in results if result["status"] == "created")
+    duplicates = sum(1 for result in results if result["status"] == "duplicate")
+    failed = sum(1 for result in results if result["status"] == "error")
+    return {"created": created, "duplicates": duplicates, "failed": failed, "results": results}
+
+
+@router.get("/account/{account_id}", response_model=List[TransactionResponse])
+async def get_account_transactions(
+    account_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """List an account's transactions, newest first; deep pages are cheaper through /page.
+
+    Rows are selected column by column and encoded without validation.
+    """
+    if limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            400,
+            f"limit is capped at {MAX_PAGE_SIZE}; page through longer histories with "
+            f"/transactions/account/{account_id}/page and its next_cursor"
+        )
+    columns = response_columns(Transaction, TransactionResponse)
+    transactions = await get_transactions_by_account_async(db, account_id, limit, skip, columns)
+    return lean_response(transactions)
+
+
+@router.get("/account/{account_id}/page", response_model=TransactionPage)
+async def get_account_transactions_page(
     account_id: int,
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    transactions = get_transactions_by_account(db, account_id, limit, skip)
-    return transactions
\ No newline at end of file
+    """A keyset page of an account's transactions, newest first; pass next_cursor back for the following page"""
+    columns = response_columns(Transaction, TransactionResponse)
+    try:
+        items, next_cursor = await get_transactions_page_async(db, account_id, limit, cursor or None, columns)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return lean_page_response(items, next_cursor)
\ No newline at end of file
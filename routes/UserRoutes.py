@@ -1,13 +1,16 @@
 # routes/UserRoutes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_read_db
+from db.lean_query import response_columns, lean_response
 from controller.userController import (
     create_user, get_all_users, get_user_by_id, get_user_by_email,
-    get_user_by_phone, update_user, delete_user
+    get_user_by_phone, update_user, delete_user, get_user_summary
 )
+from schema.models import TransactionCategory, User
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
+import hashlib
 import re
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -62,6 +65,35 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SummaryAccount(BaseModel):
+    id: int
+    account_number: str
+    bank_id: int
+    account_balance: float
+
+class SummaryBudget(BaseModel):
+    id: int
+    category: TransactionCategory
+    monthly_limit: float
+    current_spent: float
+    percentage: Optional[float] = None
+
+class UserSummaryResponse(BaseModel):
+    user_id: int
+    accounts: list[SummaryAccount]
+    total_balance: float
+    overall_balance_limit: Optional[float] = None
+    balance_limit_percentage: Optional[float] = None
+    budgets: list[SummaryBudget]
+    unread_alert_count: int
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create_user_admin(user: UserCreate, db: Session = Depends(get_db)):
@@ -87,7 +119,7 @@ def create_user_admin(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     try:
         user = get_user_by_id(db, user_id)
         if not user:
@@ -100,6 +132,30 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(500, "Internal server error")
 
 
+@router.get("/{user_id}/summary", response_model=UserSummaryResponse)
+def get_user_summary_route(user_id: int, request: Request, db: Session = Depends(get_read_db)):
+    """Everything the dashboard shows for one user.
+
+    Carries an ETag of its body; a repeat load with a matching If-None-Match
+    gets an empty 304 instead of the payload.
+    """
+    try:
+        summary = get_user_summary(db, user_id)
+    except Exception as e:
+        print(f"User summary error: {str(e)}")
+        raise HTTPException(500, "Internal server error")
+    if summary is None:
+        raise HTTPException(404, "User not found")
+
+    body = UserSummaryResponse(**summary).model_dump_json().encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    # private: per-user data; no-cache: revalidate every load, which is cheap with the ETag
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 def update_user_route(user_id: int, update_data: UserUpdate, db: Session = Depends(get_db)):
     try:
@@ -131,7 +187,7 @@ def delete_user_route(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(500, "Internal server error")
 
 @router.get("/", response_model=list[UserResponse])
-def get_all_users_route(db: Session = Depends(get_db)):
-    users = get_all_users(db)
-    return users
+def get_all_users_route(db: Session = Depends(get_read_db)):
+    users = get_all_users(db, response_columns(User, UserResponse))
+    return lean_response(users)
 
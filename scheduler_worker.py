@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Dedicated scheduler process.
+
+Runs the scheduled sync jobs outside the API, so API workers can be scaled
+with SCHEDULER_MODE=off without multiplying the sync load:
+
+    SCHEDULER_MODE=off uvicorn server:app --workers 4
+    python scheduler_worker.py
+
+Several workers may run for failover; the scheduler lease lets only one of
+them run the jobs (unless SCHEDULER_MODE=always).
+"""
+
+import os
+import signal
+import threading
+
+os.environ["SCHEDULER_MODE"] = os.getenv("SCHEDULER_WORKER_MODE", "leader")
+
+from db.database import engine
+from schema import models
+from services.scheduler import start_scheduler, stop_scheduler
+
+SYNC_INTERVAL_HOURS = int(os.getenv("SYNC_INTERVAL_HOURS", "1"))
+
+
+def main():
+    models.Base.metadata.create_all(bind=engine)
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    start_scheduler(sync_interval_hours=SYNC_INTERVAL_HOURS)
+    print("⏰ Scheduler worker running (Ctrl+C to stop)")
+    stopped.wait()
+    stop_scheduler()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from db.database import Base
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, UniqueConstraint, Index, JSON, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -36,12 +36,15 @@ class User(Base):
     password = Column(String(255), nullable=False)
     phone_no = Column(String(15), unique=True, nullable=False)
     overall_balance_limit = Column(Float, nullable=True)  # Overall balance limit across all accounts
+    # Maintained by the alert controller alongside every alert insert, read and delete
+    unread_alert_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    accounts = relationship("RegisteredUser", back_populates="owner")
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, name={self.name})>"
@@ -56,6 +59,9 @@ class Bank(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     bank_name = Column(String(100), nullable=False)
+    # How transactions are fetched for this bank's accounts (see services/connectors.py)
+    connector_type = Column(String(50), nullable=False, default="http", server_default="http")
+    connector_config = Column(JSON, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -81,8 +87,10 @@ class RegisteredUser(Base):
     account_number = Column(String(20), unique=True, nullable=False, index=True)
     ifsc_code = Column(String(11), nullable=False)
     phone_no = Column(String(15), nullable=False)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     bank_id = Column(Integer, ForeignKey("bank.id", ondelete="CASCADE"), nullable=False)
+    # Owning user; linked by email when the account or the user is created
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
 
     account_balance = Column(Float, default=0.0, nullable=False)
 
@@ -91,6 +99,7 @@ class RegisteredUser(Base):
 
     # Relationships
     bank_account = relationship("Bank", back_populates="registered_user")
+    owner = relationship("User", back_populates="accounts")
 
     transactions = relationship(
         "Transaction",
@@ -114,6 +123,11 @@ class RegisteredUser(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Serves the per-account history listing and its keyset cursor
+        Index("ix_transactions_from_account_date", "from_account_id", "transaction_date", "id"),
+        UniqueConstraint("dedup_hash", name="uq_transactions_dedup_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
@@ -126,6 +140,8 @@ class Transaction(Base):
     category = Column(Enum(TransactionCategory), nullable=False)
     transaction_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     balance_after_transaction = Column(Float, nullable=False)
+    # SHA-256 of the transaction's identifying fields, see services/dedup.py
+    dedup_hash = Column(String(64), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -181,6 +197,12 @@ class AlertType(enum.Enum):
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        UniqueConstraint("dedup_key", name="uq_alerts_dedup_key"),
+        # Inbox pages: a user's (unread) alerts, newest first, seeking on (created_at, id)
+        Index("ix_alerts_user_read_created", "user_id", "is_read", "created_at", "id"),
+        Index("ix_alerts_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -188,6 +210,9 @@ class Alert(Base):
     alert_type = Column(Enum(AlertType), nullable=False)
     message = Column(String(500), nullable=False)
     is_read = Column(Integer, default=0, nullable=False)  # 0 = unread, 1 = read
+    # Set while unread, NULL once read: emulates a partial unique index on
+    # (budget/user, alert_type) WHERE is_read = 0, since MySQL allows many NULLs
+    dedup_key = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -196,3 +221,107 @@ class Alert(Base):
 
     def __repr__(self):
         return f"<Alert(id={self.id}, type={self.alert_type.value}, user_id={self.user_id})>"
+
+
+class AlertArchive(Base):
+    """Read alerts past the retention period, moved out of the alerts table in batches"""
+    __tablename__ = "alerts_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    budget_id = Column(Integer, nullable=True)
+    alert_type = Column(Enum(AlertType), nullable=False)
+    message = Column(String(500), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<AlertArchive(id={self.id}, type={self.alert_type.value}, user_id={self.user_id})>"
+
+
+# ==========================
+# CATEGORY RULES (merchant keywords for auto-categorization)
+# ==========================
+
+class CategoryRule(Base):
+    __tablename__ = "category_rules"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    keyword = Column(String(100), unique=True, nullable=False)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    # Lower wins when several keywords match; built-in keywords use 10-50
+    priority = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CategoryRule(id={self.id}, keyword={self.keyword}, category={self.category.value})>"
+
+
+# ==========================
+# SCHEDULER LEASES
+# ==========================
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # One row per lease; whoever holds an unexpired row owns the work it guards
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(255), nullable=False)
+    acquired_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<SchedulerLease(name={self.name}, holder={self.holder}, expires_at={self.expires_at})>"
+
+
+# ==========================
+# SYNC JOBS
+# ==========================
+
+class SyncJobStatus(enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class SyncJob(Base):
+    __tablename__ = "sync_jobs"
+
+    # UUID, also written as the holder of the "full_sync" lease while the job runs
+    id = Column(String(36), primary_key=True)
+    trigger = Column(String(20), nullable=False)  # manual / scheduled
+    status = Column(Enum(SyncJobStatus), default=SyncJobStatus.QUEUED, nullable=False)
+    current_stage = Column(String(50), nullable=True)
+    # {stage: {"status": ..., "duration_ms": ..., ...counts}} in run order
+    stages = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<SyncJob(id={self.id}, status={self.status.value}, stage={self.current_stage})>"
+
+
+# ==========================
+# SYNC STATE
+# ==========================
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+
+    account_id = Column(Integer, ForeignKey("registered_users.id", ondelete="CASCADE"), primary_key=True)
+    # High-water mark: the next sync asks the bank only for transactions from here on
+    last_transaction_at = Column(DateTime, nullable=True)
+    # Opaque provider cursor, for banks that page deltas by token instead of by date
+    cursor = Column(String(255), nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    # Adaptive scheduling: due time (the queue key), current interval, and EWMA of transactions per hour
+    next_sync_at = Column(DateTime, nullable=True, index=True)
+    sync_interval_seconds = Column(Integer, nullable=True)
+    activity_rate = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncState(account_id={self.account_id}, last_transaction_at={self.last_transaction_at})>"
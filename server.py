@@ -1,13 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db.database import engine
+from db.database import engine, replica_engine, REPLICA_PIN_SECONDS
+from db.routing import ReadYourWritesMiddleware
 from schema import models
 import uvicorn
 import os
 from dotenv import load_dotenv
 
-from routes import UserRoutes, BankRoutes, BudgetRoutes, TransactionRoutes, RegisteredAccountRoutes, LoginRoutes, AlertRoutes
+from routes import UserRoutes, BankRoutes, BudgetRoutes, TransactionRoutes, RegisteredAccountRoutes, LoginRoutes, AlertRoutes, MetricsRoutes
 from services.scheduler import start_scheduler, stop_scheduler
+from services.request_metrics import RequestMetricsMiddleware
 import atexit
 
 # Load environment variables
@@ -22,8 +24,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Last-Write"],  # Read-your-writes pin for clients that don't send cookies
 )
 
+# Per-route latency, SQL count, DB time and response size, scraped from GET /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+# After a client writes, send its replica reads to the primary until the replica has caught up
+if replica_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware, pin_seconds=REPLICA_PIN_SECONDS)
+
 app.include_router(UserRoutes.router)
 app.include_router(BankRoutes.router)
 app.include_router(BudgetRoutes.router)
@@ -31,6 +41,7 @@ app.include_router(TransactionRoutes.router)
 app.include_router(RegisteredAccountRoutes.router)
 app.include_router(LoginRoutes.router)
 app.include_router(AlertRoutes.router)
+app.include_router(MetricsRoutes.router)
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
@@ -0,0 +1,91 @@
+# services/alert_retention.py
+"""
+Alert retention: move old read alerts to alerts_archive.
+
+Read alerts older than ALERT_RETENTION_DAYS are copied to alerts_archive and
+deleted from alerts, ALERT_ARCHIVE_BATCH rows per transaction, so the inbox
+table stays small and no single statement locks many rows. Unread alerts are
+never moved, however old, so unread counters are unaffected.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, literal
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.query_stats import query_source
+from schema.models import Alert, AlertArchive
+
+logger = logging.getLogger(__name__)
+
+# 0 disables archiving
+ALERT_RETENTION_DAYS = int(os.getenv("ALERT_RETENTION_DAYS", "90"))
+ALERT_ARCHIVE_BATCH = int(os.getenv("ALERT_ARCHIVE_BATCH", "1000"))
+
+
+def archive_read_alerts(db: Session, older_than_days: int, batch_size: int = ALERT_ARCHIVE_BATCH,
+                        max_batches: Optional[int] = None) -> int:
+    """Move read alerts created more than `older_than_days` ago into alerts_archive.
+
+    Walks the alerts table in primary key order and commits after each batch.
+    Returns the number of alerts archived.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+    batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        ids = db.execute(
+            select(Alert.id)
+            .where(Alert.id > last_id, Alert.is_read == 1, Alert.created_at < cutoff)
+            .order_by(Alert.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        now = datetime.utcnow()
+        db.execute(
+            insert(AlertArchive).from_select(
+                ["id", "user_id", "budget_id", "alert_type", "message", "created_at", "archived_at"],
+                select(
+                    Alert.id, Alert.user_id, Alert.budget_id, Alert.alert_type,
+                    Alert.message, Alert.created_at, literal(now)
+                ).where(Alert.id.in_(ids), Alert.is_read == 1)
+            )
+        )
+        # Same condition as the copy: an alert can't be deleted without having been archived
+        result = db.execute(delete(Alert).where(Alert.id.in_(ids), Alert.is_read == 1))
+        db.commit()
+
+        archived += result.rowcount
+        batches += 1
+    return archived
+
+
+def run_alert_retention() -> int:
+    """Scheduler job: archive with the configured retention; returns the number archived"""
+    if ALERT_RETENTION_DAYS <= 0:
+        return 0
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with query_source("alert_retention"):
+            archived = archive_read_alerts(db, ALERT_RETENTION_DAYS)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Alert retention failed: {str(e)}")
+        raise
+    finally:
+        db.close()
+    logger.info(
+        f"Archived {archived} read alerts older than {ALERT_RETENTION_DAYS} days "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return archived
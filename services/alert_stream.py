@@ -0,0 +1,205 @@
+# services/alert_stream.py
+"""
+In-process fan-out of new alerts to server-sent event streams.
+
+Each worker process runs one AlertBroker. While at least one client is
+subscribed, a single poller task reads alerts newer than the last one it
+saw, with one indexed query for all users. It hands each alert to the
+queues subscribed to that alert's user, so a thousand connected clients
+cost one query per tick, not a thousand.
+
+The poller ticks every ALERT_STREAM_POLL_SECONDS. That picks up alerts
+written by other workers and by the scheduler process. Alerts committed in
+this process wake it at once through a session after_commit hook, so they
+are pushed without waiting for the next tick.
+
+Alert ids are allocated at insert but become visible at commit, so a lower
+id can show up after a higher one. The poller remembers the ids it skipped
+over and keeps asking for them for ALERT_STREAM_COMMIT_GRACE_SECONDS; an id
+that hasn't appeared by then was rolled back or deleted. A stream resumed
+from Last-Event-ID likewise replays the user's alerts created within that
+grace before the Last-Event-ID alert. Either can deliver an alert twice
+across reconnects, so clients drop ids they already have.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event, select, func, or_
+from sqlalchemy.orm import Session
+
+from db.database import AsyncSessionLocal
+from db.query_stats import query_source
+from schema.models import Alert
+
+logger = logging.getLogger(__name__)
+
+ALERT_STREAM_POLL_SECONDS = float(os.getenv("ALERT_STREAM_POLL_SECONDS", "2"))
+# A client this many alerts behind is disconnected; EventSource reconnects and resumes from Last-Event-ID
+ALERT_STREAM_QUEUE_SIZE = int(os.getenv("ALERT_STREAM_QUEUE_SIZE", "100"))
+# How long an alert's transaction may stay open after its insert and still be streamed
+ALERT_STREAM_COMMIT_GRACE_SECONDS = float(os.getenv("ALERT_STREAM_COMMIT_GRACE_SECONDS", "60"))
+POLL_BATCH = 1000
+
+
+class AlertBroker:
+    def __init__(self, poll_interval: float = ALERT_STREAM_POLL_SECONDS):
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._last_id: Optional[int] = None
+        # Skipped ids that may still commit -> when they were first missed (monotonic)
+        self._gaps: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Queue that receives the user's new alerts; call from the event loop"""
+        queue = asyncio.Queue(maxsize=ALERT_STREAM_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            # A fresh context: the poller outlives the request that started it
+            self._task = self._loop.create_task(self._run(), context=contextvars.Context())
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def wake(self):
+        """Poll now instead of at the next tick; safe to call from any thread"""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            pass
+
+    async def _run(self):
+        wake = self._wake
+        with query_source("alert_stream"):
+            try:
+                if self._last_id is None:
+                    # Start behind the grace window: alerts committed in it may sit below ids still in flight
+                    settled = datetime.utcnow() - timedelta(seconds=ALERT_STREAM_COMMIT_GRACE_SECONDS)
+                    async with AsyncSessionLocal() as db:
+                        self._last_id = (await db.execute(
+                            select(func.max(Alert.id)).where(Alert.created_at < settled)
+                        )).scalar() or 0
+                    self._gaps.clear()
+                while self._subscribers:
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    wake.clear()
+                    try:
+                        await self._poll()
+                    except Exception as e:
+                        logger.error(f"Alert stream poll failed: {str(e)}")
+            finally:
+                if self._task is asyncio.current_task():
+                    # Restarting later resumes from the newest alert then, not from this one
+                    self._task = None
+                    self._last_id = None
+
+    async def _poll(self):
+        expired = time.monotonic() - ALERT_STREAM_COMMIT_GRACE_SECONDS
+        self._gaps = {alert_id: missed_at for alert_id, missed_at in self._gaps.items() if missed_at > expired}
+        while True:
+            condition = Alert.id > self._last_id
+            if self._gaps:
+                condition = or_(condition, Alert.id.in_(list(self._gaps)))
+            async with AsyncSessionLocal() as db:
+                alerts = (await db.execute(
+                    select(Alert).where(condition).order_by(Alert.id).limit(POLL_BATCH)
+                )).scalars().all()
+            if not alerts:
+                return
+            self._advance(alerts)
+            self._publish(alerts)
+            if len(alerts) < POLL_BATCH:
+                return
+
+    def _advance(self, alerts: List[Alert]):
+        """Move past `alerts`, remembering the ids skipped on the way as gaps"""
+        now = time.monotonic()
+        for alert in alerts:
+            if alert.id > self._last_id:
+                # A jump of more than a batch is an autoincrement skip, not that many open transactions
+                for missing in range(max(self._last_id + 1, alert.id - POLL_BATCH), alert.id):
+                    self._gaps[missing] = now
+                self._last_id = alert.id
+            else:
+                self._gaps.pop(alert.id, None)
+        while len(self._gaps) > POLL_BATCH:
+            del self._gaps[next(iter(self._gaps))]
+
+    def _publish(self, alerts: List[Alert]):
+        for alert in alerts:
+            for queue in list(self._subscribers.get(alert.user_id, ())):
+                try:
+                    queue.put_nowait(alert)
+                except asyncio.QueueFull:
+                    # Too slow to keep up: end its stream (None) and let it resume from its Last-Event-ID
+                    self.unsubscribe(alert.user_id, queue)
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+
+
+broker = AlertBroker()
+
+
+async def get_alerts_after(user_id: int, last_event_id: int, limit: int = POLL_BATCH) -> List[Alert]:
+    """The user's alerts after `last_event_id`, oldest first (stream resume)
+
+    Includes lower ids created up to the commit grace before `last_event_id`,
+    which may have committed after the client received it.
+    """
+    async with AsyncSessionLocal() as db:
+        condition = Alert.id > last_event_id
+        anchor = (await db.execute(
+            select(Alert.created_at).where(Alert.id <= last_event_id).order_by(Alert.id.desc()).limit(1)
+        )).scalar()
+        if anchor is not None:
+            condition = or_(condition, Alert.created_at >= anchor - timedelta(seconds=ALERT_STREAM_COMMIT_GRACE_SECONDS))
+        return (await db.execute(
+            select(Alert)
+            .where(Alert.user_id == user_id, condition)
+            .order_by(Alert.id)
+            .limit(limit)
+        )).scalars().all()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_new_alerts(session, flush_context):
+    if any(isinstance(obj, Alert) for obj in session.new):
+        session.info["alerts_created"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_alert_stream(session):
+    if session.info.pop("alerts_created", False):
+        broker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_new_alerts(session):
+    session.info.pop("alerts_created", None)
@@ -0,0 +1,287 @@
+# services/cache.py
+"""
+Read-through cache for rarely changing reference data (banks, overall
+balance limits). Nothing that changes per transaction belongs here.
+
+Values are JSON-serializable (response dicts, not ORM objects), stored under
+"<namespace>:<key>" with a TTL. Backends:
+- memory (default): a per-process dict with TTL and LRU eviction at
+  CACHE_MAX_ENTRIES.
+- redis: a Redis-protocol server at CACHE_REDIS_URL, shared by every worker.
+  For local use, mock_redis_server.py can stand in for Redis.
+- off: every read goes to the database.
+
+Controllers call invalidate_on_commit() when they change cached data. The
+entry is dropped once the session commits (nothing is dropped on rollback).
+A reader that loaded the old row before the commit could still store it
+afterwards, so each invalidation also bumps a generation key. A fill reads
+the generations before loading and checks them again after storing; if they
+moved, it deletes what it stored. Loaders must read from the primary: a
+replica may still return the old row after the commit.
+
+With the memory backend and CACHE_REDIS_URL set, invalidations are also
+published on a Redis channel, and every worker process drops its own copy.
+Without CACHE_REDIS_URL, other workers keep serving their copy until the TTL.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+INVALIDATION_CHANNEL = "cache-invalidation"
+# Outside every namespace, so dropping a namespace keeps its generation
+GENERATION_PREFIX = "~generation:"
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Per-process TTL + LRU store"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, tuple] = {}
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    # Generations live apart from the entries: they neither take LRU slots nor count as entries
+    def get_generation(self, key: str):
+        with self._lock:
+            entry = self._generations.get(key)
+            return entry[1] if entry is not None and entry[0] > time.monotonic() else None
+
+    def set_generation(self, key: str, value, ttl: float):
+        with self._lock:
+            now = time.monotonic()
+            if len(self._generations) >= self.max_entries:
+                self._generations = {k: entry for k, entry in self._generations.items() if entry[0] > now}
+            self._generations[key] = (now + ttl, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared store on a Redis-protocol server; values are JSON strings"""
+
+    def __init__(self, url: str):
+        import redis  # Only needed with CACHE_BACKEND=redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+
+    def get(self, key: str):
+        raw = self.client.get(key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl: float):
+        self.client.set(key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def delete_prefix(self, prefix: str):
+        keys = list(self.client.scan_iter(match=f"{prefix}*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def get_generation(self, key: str):
+        raw = self.client.get(key)
+        return None if raw is None else raw.decode()
+
+    def set_generation(self, key: str, value, ttl: float):
+        self.client.set(key, value, px=max(1, int(ttl * 1000)))
+
+
+class Cache:
+    def __init__(self, backend, ttl: float = CACHE_TTL_SECONDS, redis_url: Optional[str] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._origin = uuid.uuid4().hex
+        self._publisher = None
+        if redis_url and isinstance(backend, MemoryBackend):
+            self._start_invalidation_listener(redis_url)
+
+    @staticmethod
+    def _key(namespace: str, key) -> str:
+        return f"{namespace}:{key}"
+
+    def _get(self, full_key: str):
+        if self.backend is None:
+            return _MISSING
+        try:
+            value = self.backend.get(full_key)
+        except Exception as e:
+            # A cache outage degrades to database reads, never to errors
+            self.errors += 1
+            logger.warning(f"Cache get failed for {full_key}: {str(e)}")
+            return _MISSING
+        if value is _MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _generations(self, namespace: str, key) -> Optional[tuple]:
+        """The namespace's and the key's generations; None if the backend can't say"""
+        if self.backend is None:
+            return None
+        try:
+            return (
+                self.backend.get_generation(f"{GENERATION_PREFIX}{namespace}"),
+                self.backend.get_generation(f"{GENERATION_PREFIX}{self._key(namespace, key)}"),
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache generation read failed for {namespace}:{key}: {str(e)}")
+            return None
+
+    def _set(self, namespace: str, key, value, ttl: Optional[float], generations: Optional[tuple]):
+        """Store a loaded value, unless an invalidation ran since `generations` was read"""
+        if generations is None:
+            return
+        full_key = self._key(namespace, key)
+        try:
+            self.backend.set(full_key, value, ttl or self.ttl)
+            # Checked after storing: an invalidation either shows up here or deletes the entry itself
+            if self._generations(namespace, key) != generations:
+                self.backend.delete(full_key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache set failed for {full_key}: {str(e)}")
+
+    def get_or_load(self, namespace: str, key, loader: Callable[[], Any], ttl: Optional[float] = None):
+        """Cached value for namespace:key, calling `loader()` and storing its result on a miss"""
+        value = self._get(self._key(namespace, key))
+        if value is _MISSING:
+            generations = self._generations(namespace, key)
+            value = loader()
+            self._set(namespace, key, value, ttl, generations)
+        return value
+
+    def invalidate(self, namespace: str, key=None, publish: bool = True):
+        """Drop namespace:key now, or the whole namespace when `key` is None"""
+        if self.backend is not None:
+            try:
+                # Bump the generation first, so a fill racing this either sees it or gets deleted below
+                generation_key = GENERATION_PREFIX + (namespace if key is None else self._key(namespace, key))
+                self.backend.set_generation(generation_key, uuid.uuid4().hex, self.ttl)
+                if key is None:
+                    self.backend.delete_prefix(f"{namespace}:")
+                else:
+                    self.backend.delete(self._key(namespace, key))
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache invalidation failed for {namespace}:{key}: {str(e)}")
+        if publish and self._publisher is not None:
+            try:
+                self._publisher.publish(
+                    INVALIDATION_CHANNEL,
+                    json.dumps({"origin": self._origin, "namespace": namespace, "key": key})
+                )
+            except Exception as e:
+                logger.warning(f"Cache invalidation publish failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": len(self.backend) if isinstance(self.backend, MemoryBackend) else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "cross_process_invalidation": self._publisher is not None,
+        }
+
+    def _start_invalidation_listener(self, redis_url: str):
+        import redis
+        self._publisher = redis.Redis.from_url(redis_url, socket_timeout=1, socket_connect_timeout=1)
+        thread = threading.Thread(
+            target=self._listen_for_invalidations, args=(redis_url,), name="cache-invalidation", daemon=True
+        )
+        thread.start()
+
+    def _listen_for_invalidations(self, redis_url: str):
+        import redis
+        while True:
+            try:
+                pubsub = redis.Redis.from_url(redis_url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything could have changed while disconnected
+                self.backend.delete_prefix("")
+                for message in pubsub.listen():
+                    payload = json.loads(message["data"])
+                    if payload["origin"] != self._origin:
+                        self.invalidate(payload["namespace"], payload["key"], publish=False)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener reconnecting: {str(e)}")
+                time.sleep(1)
+
+
+def _build_cache() -> Cache:
+    if CACHE_BACKEND == "off":
+        return Cache(None)
+    if CACHE_BACKEND == "redis":
+        return Cache(RedisBackend(CACHE_REDIS_URL or "redis://localhost:6379/0"))
+    return Cache(MemoryBackend(), redis_url=CACHE_REDIS_URL)
+
+
+cache = _build_cache()
+
+
+def invalidate_on_commit(db: Session, namespace: str, key=None):
+    """Drop namespace:key (or the whole namespace) once `db` commits"""
+    db.info.setdefault("cache_invalidations", set()).add((namespace, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_invalidations(session):
+    for namespace, key in session.info.pop("cache_invalidations", ()):
+        cache.invalidate(namespace, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_invalidations(session):
+    session.info.pop("cache_invalidations", None)
@@ -0,0 +1,132 @@
+# services/categorizer.py
+"""
+Keyword categorizer compiled into an Aho-Corasick automaton.
+
+Every rule is a (keyword, category, priority) triple. A description is
+scanned once, whatever the number of rules, and the matching rule with the
+lowest priority number wins, which reproduces the old "first category list
+with any hit" order. Rules from the category_rules table are merged with
+the built-in keywords and can be reloaded at runtime.
+"""
+
+import threading
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from schema.models import CategoryRule, TransactionCategory
+
+# Built-in keywords, in the priority order auto_categorize_transaction has always used
+DEFAULT_RULES = [
+    (TransactionCategory.FOOD, 10, ['zomato', 'swiggy', 'uber eats', 'food', 'restaurant', 'cafe', 'pizza', 'burger', 'mcdonalds', 'kfc']),
+    (TransactionCategory.TRAVEL, 20, ['uber', 'ola', 'taxi', 'flight', 'hotel', 'booking', 'travel', 'train', 'bus', 'metro']),
+    (TransactionCategory.HEALTH, 30, ['pharmacy', 'hospital', 'clinic', 'medicine', 'doctor', 'health', 'medical']),
+    (TransactionCategory.HOUSEHOLD, 40, ['grocery', 'supermarket', 'walmart', 'target', 'home', 'electricity', 'water', 'gas', 'utility']),
+    (TransactionCategory.INCOME, 50, ['salary', 'income', 'payment received', 'refund', 'deposit']),
+]
+
+Rule = Tuple[str, TransactionCategory, int]
+
+
+def default_rules() -> List[Rule]:
+    return [
+        (keyword, category, priority)
+        for category, priority, keywords in DEFAULT_RULES
+        for keyword in keywords
+    ]
+
+
+class KeywordCategorizer:
+    def __init__(self, rules: Iterable[Rule], default: TransactionCategory = TransactionCategory.ANONYMOUS):
+        self.default = default
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]  # (priority, category) of the best keyword ending here or on the fail chain
+        self.rule_count = 0
+
+        for keyword, category, priority in rules:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[state][ch] = nxt
+                state = nxt
+            if self._best[state] is None or priority < self._best[state][0]:
+                self._best[state] = (priority, category)
+            self.rule_count += 1
+
+        # Breadth-first pass: fail links, and fold each state's fail-chain best into it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                inherited = self._best[self._fail[nxt]]
+                if inherited is not None and (self._best[nxt] is None or inherited[0] < self._best[nxt][0]):
+                    self._best[nxt] = inherited
+                queue.append(nxt)
+
+        top = [best[0] for best in self._best if best is not None]
+        self._top_priority = min(top) if top else None
+
+    def categorize(self, description: str) -> TransactionCategory:
+        goto, fail, best_at = self._goto, self._fail, self._best
+        top_priority = self._top_priority
+        state = 0
+        best = None
+        for ch in description.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = best_at[state]
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+                if hit[0] == top_priority:
+                    break
+        return best[1] if best else self.default
+
+    def categorize_many(self, descriptions: Iterable[str]) -> List[TransactionCategory]:
+        categorize = self.categorize
+        return [categorize(description or "") for description in descriptions]
+
+
+_lock = threading.Lock()
+_categorizer: Optional[KeywordCategorizer] = None
+
+
+def get_categorizer() -> KeywordCategorizer:
+    """Return the active categorizer, compiling the built-in rules on first use"""
+    global _categorizer
+    if _categorizer is None:
+        with _lock:
+            if _categorizer is None:
+                _categorizer = KeywordCategorizer(default_rules())
+    return _categorizer
+
+
+def reload_rules(db: Session) -> KeywordCategorizer:
+    """Recompile built-in plus category_rules keywords and swap the new automaton in"""
+    global _categorizer
+    rules = default_rules()
+    rules += [
+        (rule.keyword, rule.category, rule.priority)
+        for rule in db.query(CategoryRule).all()
+    ]
+    compiled = KeywordCategorizer(rules)
+    with _lock:
+        _categorizer = compiled
+    return compiled
+
+
+def categorize_many(descriptions: Iterable[str]) -> List[TransactionCategory]:
+    return get_categorizer().categorize_many(descriptions)
@@ -0,0 +1,194 @@
+# services/connectors.py
+"""
+Bank connectors.
+
+Each Bank row names a connector (bank.connector_type) and its settings
+(bank.connector_config). A connector yields raw transaction records for one
+account as a generator, so the sync pipeline can consume a statement of any
+size a chunk at a time.
+
+Syncs are incremental: records() is given the account's high-water mark
+(`since`) and any provider cursor from the last run, and yields only records
+dated at or after `since`. Connectors that can ask the bank for deltas do so;
+for the rest the base class filters the stream.
+
+Built-in connectors:
+    http       - the bank API (BANK_API_URL or config["base_url"]), JSON or NDJSON
+    csv        - a CSV file per account, columns mapped with config["field_map"]
+    synthetic  - deterministic generated records, for load testing
+"""
+
+import csv
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Type, Union
+
+import requests
+
+from schema.models import Bank, RegisteredUser
+
+BANK_API_URL = os.getenv("BANK_API_URL")
+BANK_API_TIMEOUT_SECONDS = float(os.getenv("BANK_API_TIMEOUT_SECONDS", "30"))
+
+CONNECTORS: Dict[str, Type["BankConnector"]] = {}
+
+
+def register_connector(name: str):
+    """Class decorator adding a connector to the registry under `name`"""
+    def decorator(cls):
+        cls.name = name
+        CONNECTORS[name] = cls
+        return cls
+    return decorator
+
+
+def as_naive_utc(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """Parse an ISO date if needed and express it as naive UTC, the form stored in the database"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if value else None
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value or None
+
+
+class BankConnector:
+    """Base class: subclasses implement fetch() as a generator of raw records"""
+
+    name = "base"
+    # True when fetch() yields records in ascending date order, which lets the
+    # high-water mark advance chunk by chunk instead of only at the end
+    ordered = False
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = config or {}
+        # Maps bank-specific field names to the canonical ones normalize_transaction expects
+        self.field_map = self.config.get("field_map") or {}
+        # Provider cursor to resume from next time, if the bank hands one out
+        self.next_cursor: Optional[str] = None
+
+    def fetch(self, account: RegisteredUser, since: Optional[datetime] = None, cursor: Optional[str] = None) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def records(self, account: RegisteredUser, since: Optional[datetime] = None, cursor: Optional[str] = None) -> Iterator[dict]:
+        """Raw records for `account` dated at or after `since`, mapped to the canonical field names.
+
+        Dates come out as naive UTC datetimes, whatever offset the bank sent.
+        """
+        since = as_naive_utc(since)
+        for raw in self.fetch(account, since=since, cursor=cursor):
+            if self.field_map:
+                raw = {self.field_map.get(key, key): value for key, value in raw.items()}
+            if raw.get("transaction_date"):
+                raw["transaction_date"] = as_naive_utc(raw["transaction_date"])
+                if since is not None and raw["transaction_date"] < since:
+                    continue
+            yield raw
+
+
+@register_connector("http")
+class HttpConnector(BankConnector):
+    """Bank API: GET {base_url}/banks/{bank_id}/accounts/{account_number}/transactions
+
+    Passes ?since=<ISO date> and ?cursor=<token> so the bank can return only
+    deltas, and keeps the X-Next-Cursor response header for the next sync.
+    """
+
+    def fetch(self, account: RegisteredUser, since: Optional[datetime] = None, cursor: Optional[str] = None) -> Iterator[dict]:
+        base_url = self.config.get("base_url") or BANK_API_URL
+        if not base_url:
+            return
+        params = {}
+        if since is not None:
+            params["since"] = since.isoformat()
+        if cursor:
+            params["cursor"] = cursor
+        with requests.get(
+            f"{base_url.rstrip('/')}/banks/{account.bank_id}/accounts/{account.account_number}/transactions",
+            params=params,
+            headers={"Accept": "application/x-ndjson, application/json"},
+            timeout=self.config.get("timeout", BANK_API_TIMEOUT_SECONDS),
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            self.next_cursor = response.headers.get("X-Next-Cursor") or cursor
+            # NDJSON is read line by line; a plain JSON array has to be parsed whole
+            if "ndjson" in response.headers.get("Content-Type", ""):
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+            else:
+                yield from response.json()
+
+
+@register_connector("csv")
+class CsvConnector(BankConnector):
+    """CSV export per account; config["path"] may contain {account_number} and {bank_id}.
+
+    Set config["ordered"] when exports are sorted oldest first.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        super().__init__(config)
+        self.ordered = bool(self.config.get("ordered", False))
+
+    def fetch(self, account: RegisteredUser, since: Optional[datetime] = None, cursor: Optional[str] = None) -> Iterator[dict]:
+        path = self.config["path"].format(account_number=account.account_number, bank_id=account.bank_id)
+        if not os.path.exists(path):
+            return
+        date_format = self.config.get("date_format")
+        date_column = self.config.get("date_column", "transaction_date")
+        with open(path, newline="", encoding=self.config.get("encoding", "utf-8")) as f:
+            for row in csv.DictReader(f, delimiter=self.config.get("delimiter", ",")):
+                if date_format and row.get(date_column):
+                    row[date_column] = datetime.strptime(row[date_column], date_format)
+                yield row
+
+
+@register_connector("synthetic")
+class SyntheticConnector(BankConnector):
+    """Deterministic generated statement, oldest first; config: count (default 1000), days (default 30)"""
+
+    DESCRIPTIONS = [
+        "SWIGGY ORDER", "UBER TRIP", "APOLLO PHARMACY", "BIGBASKET GROCERY", "SALARY CREDIT",
+        "ZOMATO", "IRCTC TRAIN BOOKING", "ELECTRICITY BILL", "CAFE COFFEE DAY", "ATM WITHDRAWAL"
+    ]
+
+    ordered = True
+
+    def fetch(self, account: RegisteredUser, since: Optional[datetime] = None, cursor: Optional[str] = None) -> Iterator[dict]:
+        count = int(self.config.get("count", 1000))
+        days = int(self.config.get("days", 30))
+        rng = random.Random(f"{self.config.get('seed', 0)}:{account.account_number}")
+        start = datetime(2024, 1, 1)
+        step = days * 86400 / max(count, 1)
+        for i in range(count):
+            description = rng.choice(self.DESCRIPTIONS)
+            yield {
+                "external_id": f"{account.account_number}-{i:09d}",
+                "transaction_date": start + timedelta(seconds=int(i * step)),
+                "transaction_type": "CREDIT" if "SALARY" in description else "DEBIT",
+                "amount": round(rng.uniform(1, 500), 2),
+                "description": description,
+            }
+
+
+def get_connector(bank: Optional[Bank]) -> BankConnector:
+    """Instantiate the connector configured on `bank` (http when unset)"""
+    connector_type = (bank.connector_type if bank is not None else None) or "http"
+    connector_cls = CONNECTORS.get(connector_type)
+    if connector_cls is None:
+        raise ValueError(f"Unknown connector type: {connector_type}")
+    return connector_cls(bank.connector_config if bank is not None else None)
+
+
+def chunked(records: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    """Group a record stream into lists of at most `size` records"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,71 @@
+# services/dedup.py
+"""
+Transaction deduplication by content hash.
+
+Every stored transaction carries a unique dedup_hash. Incoming candidates
+are checked a whole batch at a time with one IN query.
+"""
+
+import hashlib
+from typing import Iterable, List, Set
+
+from sqlalchemy.orm import Session
+from schema.models import Transaction
+from services.connectors import as_naive_utc
+
+IN_QUERY_CHUNK = 1000
+
+
+def generate_transaction_hash(transaction_data: dict) -> str:
+    """SHA-256 of a transaction's source identity, for deduplication.
+
+    The bank's external_id identifies a transaction on its own; without one,
+    the account, amount, date, type and the bank's raw description do. Nothing
+    derived here (the category) goes in, so a re-fetched row that categorizes
+    differently after a rule change still matches its stored copy.
+    """
+    from_account_id = transaction_data.get('from_account_id')
+    external_id = transaction_data.get('external_id')
+    if external_id:
+        hash_string = f"{from_account_id}_ext_{external_id}"
+    else:
+        transaction_date = as_naive_utc(transaction_data.get('transaction_date'))
+        transaction_type = transaction_data.get('transaction_type')
+        transaction_type = getattr(transaction_type, 'value', transaction_type)
+        amount = float(transaction_data.get('amount') or 0)
+        hash_string = (
+            f"{from_account_id}_{amount:.2f}_{transaction_date.isoformat() if transaction_date else ''}_"
+            f"{transaction_type}_{transaction_data.get('description') or ''}"
+        )
+    return hashlib.sha256(hash_string.encode()).hexdigest()
+
+
+def find_existing_hashes(db: Session, hashes: Iterable[str]) -> Set[str]:
+    """Return which of `hashes` are already stored, one IN query per 1000 hashes"""
+    hashes = list(set(hashes))
+    existing = set()
+    for start in range(0, len(hashes), IN_QUERY_CHUNK):
+        chunk = hashes[start:start + IN_QUERY_CHUNK]
+        existing.update(
+            row[0] for row in
+            db.query(Transaction.dedup_hash).filter(Transaction.dedup_hash.in_(chunk))
+        )
+    return existing
+
+
+def filter_new_transactions(db: Session, candidates: List[dict]) -> List[dict]:
+    """Batch dedup stage: drop candidates already stored or repeated within the batch.
+
+    Sets `dedup_hash` on each candidate.
+    """
+    unique = []
+    seen = set()
+    for candidate in candidates:
+        candidate['dedup_hash'] = candidate.get('dedup_hash') or generate_transaction_hash(candidate)
+        if candidate['dedup_hash'] in seen:
+            continue
+        seen.add(candidate['dedup_hash'])
+        unique.append(candidate)
+
+    existing = find_existing_hashes(db, (candidate['dedup_hash'] for candidate in unique))
+    return [candidate for candidate in unique if candidate['dedup_hash'] not in existing]
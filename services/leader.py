@@ -0,0 +1,120 @@
+# services/leader.py
+"""
+DB-backed leases for electing a single owner of scheduled work.
+
+A lease is a row in scheduler_leases. A process owns it while its holder id
+is on the row and expires_at is in the future; it keeps it by renewing
+before expiry. If the owner dies, the lease lapses and the next process to
+try takes it over. Acquire and renew are one conditional UPDATE, falling
+back to an INSERT that the primary key makes race-free.
+
+Expiry uses each process's UTC clock, so hosts need roughly synced clocks
+(well within the TTL).
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update, delete, or_, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from schema.models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+LEASE_TTL_SECONDS = int(os.getenv("LEASE_TTL_SECONDS", "60"))
+
+# Unique per process, readable in the table: host:pid:random
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire_lease(db: Session, name: str, holder: str, ttl_seconds: int = LEASE_TTL_SECONDS) -> bool:
+    """Take or renew lease `name` for `holder`; False while someone else holds it. Commits."""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    result = db.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now)
+        )
+        # MySQL applies SET assignments left to right, so acquired_at must read
+        # the holder before it is overwritten
+        .ordered_values(
+            (SchedulerLease.acquired_at, case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now)),
+            (SchedulerLease.holder, holder),
+            (SchedulerLease.expires_at, expires_at),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        db.commit()
+        return True
+
+    # No row yet (or held by someone else): only one concurrent INSERT can win
+    try:
+        db.add(SchedulerLease(name=name, holder=holder, acquired_at=now, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+
+def release_lease(db: Session, name: str, holder: str) -> bool:
+    """Give up lease `name` if `holder` owns it, so another process can take over at once. Commits."""
+    result = db.execute(
+        delete(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return bool(result.rowcount)
+
+
+class LeaderElector:
+    """Tracks whether this process holds lease `name`; call heartbeat() well within the TTL"""
+
+    def __init__(self, name: str, ttl_seconds: int = LEASE_TTL_SECONDS, holder: str = INSTANCE_ID):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = holder
+        self.is_leader = False
+
+    def heartbeat(self) -> bool:
+        """Acquire or renew the lease; returns whether this process is the leader"""
+        db = SessionLocal()
+        try:
+            acquired = try_acquire_lease(db, self.name, self.holder, self.ttl_seconds)
+        except Exception as e:
+            # Can't confirm the lease, so stop acting as leader until we can
+            logger.error(f"Error renewing lease '{self.name}': {str(e)}")
+            acquired = False
+        finally:
+            db.close()
+
+        if acquired and not self.is_leader:
+            logger.info(f"Acquired lease '{self.name}' as {self.holder}")
+        elif self.is_leader and not acquired:
+            logger.warning(f"Lost lease '{self.name}'")
+        self.is_leader = acquired
+        return acquired
+
+    def release(self):
+        if not self.is_leader:
+            return
+        db = SessionLocal()
+        try:
+            release_lease(db, self.name, self.holder)
+            logger.info(f"Released lease '{self.name}'")
+        except Exception as e:
+            logger.error(f"Error releasing lease '{self.name}': {str(e)}")
+        finally:
+            db.close()
+            self.is_leader = False
@@ -0,0 +1,103 @@
+# services/pipeline.py
+"""
+Stage graph for the sync workflow.
+
+A Pipeline is a set of named stages, each declaring the stages it requires.
+A run executes every stage exactly once, in dependency order, on one shared
+session. Stages read upstream output from ctx.results instead of
+recomputing it, and each stage's timing and row counts are recorded.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.query_stats import query_source
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """A unit of work: func(ctx) returns a dict of row counts / outputs (or None)"""
+
+    def __init__(self, name: str, func: Callable[["PipelineContext"], Optional[dict]], requires: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+
+class PipelineContext:
+    """What a stage sees: the run's shared session and the outputs of finished stages"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.results: Dict[str, dict] = {}
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage]):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = self._resolve_order()
+
+    def _resolve_order(self) -> List[str]:
+        """Topological order of the stages; rejects unknown inputs and cycles"""
+        order, done, visiting = [], set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through: {name}")
+            visiting.add(name)
+            for required in self.stages[name].requires:
+                if required not in self.stages:
+                    raise ValueError(f"Stage {name} requires unknown stage {required}")
+                visit(required)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def run(self, on_stage: Optional[Callable[[str, str, dict], None]] = None) -> Dict[str, dict]:
+        """Run every stage once and commit after each; returns {stage: details}.
+
+        `on_stage(stage, status, details)` is called as each stage starts and
+        finishes. A failing stage is rolled back and re-raised.
+        """
+        db = SessionLocal()
+        ctx = PipelineContext(db)
+        started_run = time.perf_counter()
+        try:
+            for name in self.order:
+                stage = self.stages[name]
+                if on_stage:
+                    on_stage(name, "running", {})
+                started = time.perf_counter()
+                try:
+                    with query_source(f"stage:{name}"):
+                        details = stage.func(ctx) or {}
+                        db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.error(f"Stage {name} failed after {time.perf_counter() - started:.2f}s")
+                    raise
+                details["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                ctx.results[name] = details
+                logger.info(f"Stage {name}: {details}")
+                if on_stage:
+                    on_stage(name, "done", details)
+        finally:
+            db.close()
+
+        logger.info(f"Pipeline completed {len(self.order)} stages in {time.perf_counter() - started_run:.2f}s")
+        return ctx.results
@@ -1,43 +1,133 @@
 # services/scheduler.py
 """
 APScheduler integration for scheduled sync
+
+SCHEDULER_MODE controls which processes run the scheduled jobs:
+    leader  (default) every process runs the scheduler, but a job only runs in
+            the one holding the "scheduler" lease; another takes over when it lapses
+    always  run the jobs unconditionally (single-process deployments)
+    off     don't schedule anything here (API workers next to scheduler_worker.py)
+
+SYNC_SCHEDULE picks what the hourly job does:
+    fixed     (default) sync every account each hour
+    adaptive  every SYNC_TICK_SECONDS, sync only the accounts that are due;
+              each account's interval follows its transaction rate
+The midnight full sync runs in both, and reconciles budgets and alerts.
 """
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 import logging
-from services.sync_service import full_sync_workflow
+import os
+from db.database import SessionLocal
+from db.query_stats import query_source
+from services.sync_jobs import run_full_sync, full_sync_in_flight
+from services.sync_service import sync_due_accounts
+from services.alert_retention import run_alert_retention
+from services.leader import LeaderElector, LEASE_TTL_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "leader").lower()
+SYNC_SCHEDULE = os.getenv("SYNC_SCHEDULE", "fixed").lower()
+SYNC_TICK_SECONDS = int(os.getenv("SYNC_TICK_SECONDS", "60"))
+
 scheduler = BackgroundScheduler()
+elector = LeaderElector("scheduler")
+
+
+def run_scheduled_sync():
+    """Run the full sync if this process owns the scheduled jobs"""
+    if SCHEDULER_MODE == "leader" and not elector.heartbeat():
+        logger.info("Skipping scheduled sync: another instance holds the scheduler lease")
+        return
+    # Joins instead of overlapping when a manual trigger is already running
+    run_full_sync(trigger="scheduled")
+
+
+def run_due_account_sync():
+    """Adaptive tick: sync the accounts whose next_sync_at has passed"""
+    if SCHEDULER_MODE == "leader" and not elector.heartbeat():
+        return
+    db = SessionLocal()
+    try:
+        # A running full sync covers every account already
+        if full_sync_in_flight(db):
+            logger.info("Skipping adaptive sync tick: a full sync is in flight")
+            return
+    finally:
+        db.close()
+    with query_source("adaptive_sync"):
+        reports = sync_due_accounts()
+    if reports:
+        logger.info(f"Adaptive sync tick synced {len(reports)} due accounts")
+
+
+def run_scheduled_alert_retention():
+    """Archive old read alerts if this process owns the scheduled jobs"""
+    if SCHEDULER_MODE == "leader" and not elector.heartbeat():
+        return
+    run_alert_retention()
 
 
 def start_scheduler(sync_interval_hours: int = 1):
     """Start the scheduler with specified interval"""
+    if SCHEDULER_MODE == "off":
+        logger.info("Scheduler disabled in this process (SCHEDULER_MODE=off)")
+        return
     try:
-        # Add hourly sync job
-        scheduler.add_job(
-            func=full_sync_workflow,
-            trigger=IntervalTrigger(hours=sync_interval_hours),
-            id='hourly_sync',
-            name='Hourly transaction sync and budget check',
-            replace_existing=True
-        )
-        
+        if SYNC_SCHEDULE == "adaptive":
+            # Due accounts only; the queue decides how often each one syncs
+            scheduler.add_job(
+                func=run_due_account_sync,
+                trigger=IntervalTrigger(seconds=SYNC_TICK_SECONDS),
+                id='adaptive_sync',
+                name='Adaptive sync of due accounts',
+                replace_existing=True
+            )
+        else:
+            # Add hourly sync job
+            scheduler.add_job(
+                func=run_scheduled_sync,
+                trigger=IntervalTrigger(hours=sync_interval_hours),
+                id='hourly_sync',
+                name='Hourly transaction sync and budget check',
+                replace_existing=True
+            )
+
         # Add daily sync job at midnight
         scheduler.add_job(
-            func=full_sync_workflow,
+            func=run_scheduled_sync,
             trigger=CronTrigger(hour=0, minute=0),
             id='daily_sync',
             name='Daily transaction sync and budget check',
             replace_existing=True
         )
-        
+
+        # Archive old read alerts daily, away from the midnight sync
+        scheduler.add_job(
+            func=run_scheduled_alert_retention,
+            trigger=CronTrigger(hour=3, minute=30),
+            id='alert_retention',
+            name='Daily archive of old read alerts',
+            replace_existing=True
+        )
+
+        if SCHEDULER_MODE == "leader":
+            # Renew well within the TTL, so the lease survives long syncs and lapses quickly on death
+            elector.heartbeat()
+            scheduler.add_job(
+                func=elector.heartbeat,
+                trigger=IntervalTrigger(seconds=max(1, LEASE_TTL_SECONDS // 3)),
+                id='leader_heartbeat',
+                name='Scheduler lease heartbeat',
+                replace_existing=True
+            )
+
         scheduler.start()
-        logger.info(f"Scheduler started with {sync_interval_hours}-hour interval")
+        logger.info(f"Scheduler started with {sync_interval_hours}-hour interval (mode: {SCHEDULER_MODE}, schedule: {SYNC_SCHEDULE})")
         logger.info("Scheduled jobs:")
         for job in scheduler.get_jobs():
             logger.info(f"  - {job.name} (ID: {job.id})")
@@ -47,9 +137,11 @@ def start_scheduler(sync_interval_hours: int = 1):
 
 def stop_scheduler():
     """Stop the scheduler"""
-    try:
-        scheduler.shutdown()
-        logger.info("Scheduler stopped")
-    except Exception as e:
-        logger.error(f"Error stopping scheduler: {str(e)}")
-
+    if scheduler.running:
+        try:
+            scheduler.shutdown()
+            logger.info("Scheduler stopped")
+        except Exception as e:
+            logger.error(f"Error stopping scheduler: {str(e)}")
+    # Hand the lease over now instead of making the others wait out the TTL
+    elector.release()
@@ -0,0 +1,147 @@
+# services/sync_jobs.py
+"""
+Sync jobs: full_sync_workflow runs tracked in the sync_jobs table.
+
+At most one full sync runs at a time across all processes. A run holds the
+"full_sync" lease with its job id as holder; a trigger that can't take the
+lease joins the in-flight run and gets that job's id back, whether the run
+came from the API or from the scheduler.
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from schema.models import SyncJob, SyncJobStatus, SchedulerLease
+from services.leader import try_acquire_lease, release_lease, LEASE_TTL_SECONDS
+from services.sync_service import full_sync_workflow
+
+logger = logging.getLogger(__name__)
+
+FULL_SYNC_LEASE = "full_sync"
+ACTIVE_STATUSES = (SyncJobStatus.QUEUED, SyncJobStatus.RUNNING)
+
+# One run per process at a time is all single-flight allows anyway
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-job")
+
+
+def get_sync_job(db: Session, job_id: str) -> Optional[SyncJob]:
+    return db.query(SyncJob).filter(SyncJob.id == job_id).first()
+
+
+def full_sync_in_flight(db: Session) -> bool:
+    """Whether some process currently holds the full sync lease"""
+    lease = db.query(SchedulerLease).filter(SchedulerLease.name == FULL_SYNC_LEASE).first()
+    return lease is not None and lease.expires_at > datetime.utcnow()
+
+
+def start_or_join_sync(db: Session, trigger: str) -> Tuple[str, bool]:
+    """Claim the full sync for a new job, or find the one in flight.
+
+    Returns (job_id, joined). With joined False the caller owns the new job
+    and must run it with run_sync_job.
+    """
+    for _ in range(3):
+        # The job row exists before the lease names it, so a joiner can always read it
+        job_id = str(uuid.uuid4())
+        db.add(SyncJob(id=job_id, trigger=trigger, status=SyncJobStatus.QUEUED, stages={}))
+        db.commit()
+
+        if try_acquire_lease(db, FULL_SYNC_LEASE, job_id):
+            # Anything still marked active lost its lease without finishing (its process died)
+            db.query(SyncJob).filter(
+                SyncJob.id != job_id,
+                SyncJob.status.in_(ACTIVE_STATUSES)
+            ).update(
+                {"status": SyncJobStatus.FAILED, "error": "Abandoned: lease expired", "finished_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+            return job_id, False
+
+        db.query(SyncJob).filter(SyncJob.id == job_id).delete(synchronize_session=False)
+        lease = db.query(SchedulerLease).filter(SchedulerLease.name == FULL_SYNC_LEASE).first()
+        db.commit()
+        if lease is not None:
+            return lease.holder, True
+        # The running job finished between our attempt and the lookup; try again
+
+    raise RuntimeError("Could not start or join a sync job")
+
+
+def _keep_lease(job_id: str, stopped: threading.Event):
+    """Renew the job's lease until it finishes, so long syncs aren't taken over"""
+    while not stopped.wait(max(1, LEASE_TTL_SECONDS // 3)):
+        db = SessionLocal()
+        try:
+            if not try_acquire_lease(db, FULL_SYNC_LEASE, job_id):
+                logger.warning(f"Sync job {job_id} lost the {FULL_SYNC_LEASE} lease")
+        except Exception as e:
+            logger.error(f"Error renewing lease for sync job {job_id}: {str(e)}")
+        finally:
+            db.close()
+
+
+def run_sync_job(job_id: str):
+    """Run the full sync for a job claimed by start_or_join_sync, recording per-stage progress"""
+    db = SessionLocal()
+    stopped = threading.Event()
+    threading.Thread(target=_keep_lease, args=(job_id, stopped), daemon=True).start()
+    try:
+        job = get_sync_job(db, job_id)
+        job.status = SyncJobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        db.commit()
+
+        def on_stage(stage: str, stage_status: str, details: dict):
+            job.current_stage = stage
+            job.stages = {**(job.stages or {}), stage: {"status": stage_status, **details}}
+            db.commit()
+
+        try:
+            full_sync_workflow(on_stage=on_stage)
+            job.status = SyncJobStatus.SUCCEEDED
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Sync job {job_id} failed: {str(e)}")
+            job.status = SyncJobStatus.FAILED
+            job.error = str(e)
+            if job.current_stage:
+                job.stages = {**(job.stages or {}), job.current_stage: {"status": "failed"}}
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        stopped.set()
+        try:
+            release_lease(db, FULL_SYNC_LEASE, job_id)
+        except Exception as e:
+            logger.error(f"Error releasing lease for sync job {job_id}: {str(e)}")
+        db.close()
+
+
+def enqueue_full_sync(db: Session, trigger: str = "manual") -> Tuple[str, bool]:
+    """Start a full sync in the background, or join the one in flight; returns (job_id, joined)"""
+    job_id, joined = start_or_join_sync(db, trigger)
+    if not joined:
+        _executor.submit(run_sync_job, job_id)
+    return job_id, joined
+
+
+def run_full_sync(trigger: str = "scheduled") -> Tuple[str, bool]:
+    """Run a full sync in the calling thread unless one is already in flight"""
+    db = SessionLocal()
+    try:
+        job_id, joined = start_or_join_sync(db, trigger)
+    finally:
+        db.close()
+    if joined:
+        logger.info(f"Full sync already in flight as job {job_id}; not starting another")
+    else:
+        run_sync_job(job_id)
+    return job_id, joined
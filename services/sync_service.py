@@ -4,238 +4,395 @@ Scheduled Sync Service
 Automated fetching → normalize → dedup → categorize → store → check budgets → generate alerts
 """
 
+from sqlalchemy import select, update, func, or_
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
-from schema.models import Transaction, TransactionCategory, RegisteredUser, Budget
-from controller.AlertController import check_and_generate_budget_alerts, check_overall_balance_limit_alert
-from controller.TransactionController import create_transaction
+from db.database import SessionLocal, ReadSessionLocal
+from schema.models import Transaction, TransactionCategory, TransactionType, RegisteredUser, Budget, SyncState
+from controller.AlertController import generate_alerts_bulk
+from controller.TransactionController import apply_transaction_batch
+from services.categorizer import get_categorizer, reload_rules, categorize_many
+from services.connectors import get_connector, chunked, as_naive_utc
+from services.dedup import filter_new_transactions
+from services.pipeline import Pipeline, Stage, PipelineContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import hashlib
+from typing import Callable, List, Optional
+import contextvars
+import threading
 import logging
+import time
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYNC_MAX_WORKERS = int(os.getenv("SYNC_MAX_WORKERS", "8"))
+SYNC_PER_BANK_CONCURRENCY = int(os.getenv("SYNC_PER_BANK_CONCURRENCY", "2"))
+# Records held in memory per account at any time while streaming a statement
+SYNC_CHUNK_SIZE = int(os.getenv("SYNC_CHUNK_SIZE", "1000"))
 
-def generate_transaction_hash(transaction_data: dict) -> str:
-    """Generate SHA-256 hash for transaction deduplication"""
-    # Create a unique string from transaction data
-    hash_string = f"{transaction_data.get('from_account_id')}_{transaction_data.get('amount')}_{transaction_data.get('transaction_date')}_{transaction_data.get('category')}"
-    return hashlib.sha256(hash_string.encode()).hexdigest()
+# Adaptive scheduling (SYNC_SCHEDULE=adaptive): each account is due again once
+# it is expected to have SYNC_TARGET_PER_SYNC new transactions, going by an
+# EWMA of its transaction rate, within the min/max interval bounds
+SYNC_MIN_INTERVAL_SECONDS = int(os.getenv("SYNC_MIN_INTERVAL_SECONDS", "300"))
+SYNC_MAX_INTERVAL_SECONDS = int(os.getenv("SYNC_MAX_INTERVAL_SECONDS", "86400"))
+SYNC_TARGET_PER_SYNC = float(os.getenv("SYNC_TARGET_PER_SYNC", "5"))
+SYNC_RATE_SMOOTHING = float(os.getenv("SYNC_RATE_SMOOTHING", "0.3"))
+SYNC_DUE_BATCH = int(os.getenv("SYNC_DUE_BATCH", "500"))
+# Due time that sorts ahead of every real one; used to bump an account to the front
+FRONT_OF_QUEUE = datetime(1970, 1, 1)
 
 
 def normalize_transaction(raw_transaction: dict) -> dict:
     """Normalize different bank formats to canonical schema"""
     # This is a mock normalization - in real scenario, you'd have different bank formats
+    transaction_type = raw_transaction.get('transaction_type')
+    if isinstance(transaction_type, str):
+        transaction_type = TransactionType(transaction_type.upper())
+    category = raw_transaction.get('category') or None
+    if isinstance(category, str):
+        category = TransactionCategory(category.upper())
+    elif category is None:
+        category = auto_categorize_transaction(raw_transaction.get('description') or "")
+    transaction_date = as_naive_utc(raw_transaction.get('transaction_date')) or datetime.utcnow()
+
     normalized = {
         'from_account_id': raw_transaction.get('from_account_id'),
         'to_account_id': raw_transaction.get('to_account_id'),
-        'transaction_type': raw_transaction.get('transaction_type'),
+        'transaction_type': transaction_type,
         'amount': float(raw_transaction.get('amount', 0)),
-        'category': raw_transaction.get('category', TransactionCategory.ANONYMOUS),
-        'transaction_date': raw_transaction.get('transaction_date', datetime.utcnow()),
-        'balance_after_transaction': raw_transaction.get('balance_after_transaction', 0)
+        'category': category,
+        'transaction_date': transaction_date,
+        'balance_after_transaction': float(raw_transaction.get('balance_after_transaction') or 0),
+        'external_id': raw_transaction.get('external_id'),
+        # Not stored; part of the dedup hash when the bank sends no external_id
+        'description': raw_transaction.get('description')
     }
     return normalized
 
 
 def auto_categorize_transaction(description: str = "", amount: float = 0) -> TransactionCategory:
     """Auto-categorize transaction based on keywords"""
-    description_lower = description.lower()
-    
-    # Food keywords
-    food_keywords = ['zomato', 'swiggy', 'uber eats', 'food', 'restaurant', 'cafe', 'pizza', 'burger', 'mcdonalds', 'kfc']
-    if any(keyword in description_lower for keyword in food_keywords):
-        return TransactionCategory.FOOD
-    
-    # Travel keywords
-    travel_keywords = ['uber', 'ola', 'taxi', 'flight', 'hotel', 'booking', 'travel', 'train', 'bus', 'metro']
-    if any(keyword in description_lower for keyword in travel_keywords):
-        return TransactionCategory.TRAVEL
-    
-    # Health keywords
-    health_keywords = ['pharmacy', 'hospital', 'clinic', 'medicine', 'doctor', 'health', 'medical']
-    if any(keyword in description_lower for keyword in health_keywords):
-        return TransactionCategory.HEALTH
+    return get_categorizer().categorize(description)
+
+
+def normalize_chunk(raw_transactions: List[dict], account_id: int) -> List[dict]:
+    """Normalize a chunk of raw records for one account, categorizing them in one pass"""
+    uncategorized = [raw for raw in raw_transactions if not raw.get('category')]
+    categories = categorize_many(raw.get('description') for raw in uncategorized)
+    for raw, category in zip(uncategorized, categories):
+        raw['category'] = category
+    return [
+        normalize_transaction({**raw, 'from_account_id': account_id})
+        for raw in raw_transactions
+    ]
+
+
+def get_sync_state(db: Session, account_id: int) -> SyncState:
+    """The account's sync state row, created (unflushed) on first sync"""
+    state = db.query(SyncState).filter(SyncState.account_id == account_id).first()
+    if state is None:
+        state = SyncState(account_id=account_id)
+        db.add(state)
+    return state
+
+
+def sync_transactions_for_account(db: Session, account_id: int, chunk_size: Optional[int] = None) -> int:
+    """Sync transactions for a specific account; returns the number stored.
+
+    Fetches only deltas: the connector is asked for transactions dated at or
+    after the account's high-water mark in sync_state (plus any provider
+    cursor). Records stream through normalize → categorize → dedup → store in
+    chunks of `chunk_size`, and the high-water mark is committed together with
+    each chunk's rows (or once at the end, for connectors that don't yield in
+    date order). The mark is inclusive, so rows sharing its timestamp are
+    refetched and dropped by dedup rather than missed. When the bank reports
+    balance_after_transaction, the account's balance is checked against the
+    newest one and a mismatch is logged. Errors propagate so the caller can
+    isolate and report them per account.
+    """
+    chunk_size = chunk_size or SYNC_CHUNK_SIZE
+    account = db.query(RegisteredUser).filter(RegisteredUser.id == account_id).first()
+    if not account:
+        logger.warning(f"Account {account_id} not found")
+        return 0
     
-    # Household keywords
-    household_keywords = ['grocery', 'supermarket', 'walmart', 'target', 'home', 'electricity', 'water', 'gas', 'utility']
-    if any(keyword in description_lower for keyword in household_keywords):
-        return TransactionCategory.HOUSEHOLD
+    connector = get_connector(account.bank_account)
+    state = get_sync_state(db, account_id)
+    since, cursor = state.last_transaction_at, state.cursor
+    logger.info(f"Syncing transactions for account {account_id} via {connector.name} connector since {since}")
     
-    # Income keywords
-    income_keywords = ['salary', 'income', 'payment received', 'refund', 'deposit']
-    if any(keyword in description_lower for keyword in income_keywords):
-        return TransactionCategory.INCOME
+    stored = 0
+    high_water = since
+    bank_balance = None  # (transaction_date, balance_after_transaction) of the newest record
+    for raw_chunk in chunked(connector.records(account, since=since, cursor=cursor), chunk_size):
+        # Only dates that came from the bank move the mark, not the utcnow fallback
+        dated = [raw.get('transaction_date') for raw in raw_chunk if raw.get('transaction_date')]
+        candidates = normalize_chunk(raw_chunk, account_id)
+        for raw, candidate in zip(raw_chunk, candidates):
+            if raw.get('transaction_date') and raw.get('balance_after_transaction') is not None:
+                if bank_balance is None or candidate['transaction_date'] >= bank_balance[0]:
+                    bank_balance = (candidate['transaction_date'], candidate['balance_after_transaction'])
+        new_transactions = filter_new_transactions(db, candidates)
+        if new_transactions:
+            results = apply_transaction_batch(db, new_transactions)
+            stored += sum(1 for result in results if result["status"] == "created")
+        if dated:
+            chunk_high = max(as_naive_utc(value) for value in dated)
+            high_water = max(high_water, chunk_high) if high_water else chunk_high
+        if connector.ordered:
+            state.last_transaction_at = high_water
+        db.commit()
     
-    # Default to anonymous if no match
-    return TransactionCategory.ANONYMOUS
+    if bank_balance is not None:
+        balance = db.query(RegisteredUser.account_balance).filter(RegisteredUser.id == account_id).scalar()
+        if abs(balance - bank_balance[1]) > 0.005:
+            logger.warning(
+                f"Account {account_id} balance {balance:.2f} differs from the bank's "
+                f"{bank_balance[1]:.2f} as of {bank_balance[0]}"
+            )
 
+    # Reached the end of the stream: everything up to high_water is stored
+    now = datetime.utcnow()
+    state.last_transaction_at = high_water
+    state.cursor = connector.next_cursor or cursor
+    schedule_next_sync(state, stored, now)
+    state.last_synced_at = now
+    db.commit()
+    return stored
 
-def check_duplicate_transaction(db: Session, transaction_hash: str, from_account_id: int, amount: float, transaction_date: datetime) -> bool:
-    """Check if transaction already exists (deduplication)"""
-    # Check for duplicate within a time window (e.g., same day)
-    start_date = transaction_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_date = start_date + timedelta(days=1)
-    
-    existing = db.query(Transaction).filter(
-        Transaction.from_account_id == from_account_id,
-        Transaction.amount == amount,
-        Transaction.transaction_date >= start_date,
-        Transaction.transaction_date < end_date
-    ).first()
-    
-    return existing is not None
 
+def _sync_account_worker(account_id: int, bank_id: int, bank_slots: threading.BoundedSemaphore) -> dict:
+    """Sync one account on its own session, holding one of its bank's slots"""
+    report = {"account_id": account_id, "bank_id": bank_id, "status": "ok", "stored": 0, "error": None}
+    with bank_slots:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            report["stored"] = sync_transactions_for_account(db, account_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            report["status"] = "error"
+            report["error"] = str(e)
+            logger.error(f"Error syncing account {account_id}: {str(e)}")
+        finally:
+            db.close()
+            report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
 
-def update_budget_spent(db: Session, user_id: int, category: TransactionCategory, amount: float):
-    """Update budget spent amount for a category"""
-    budget = db.query(Budget).filter(
-        Budget.user_id == user_id,
-        Budget.category == category
-    ).first()
-    
-    if budget:
-        budget.current_spent += amount
-        db.flush()
 
+def schedule_next_sync(state: SyncState, stored: int, now: datetime):
+    """Fold this sync into the account's transaction-rate EWMA and set its next due time"""
+    if state.last_synced_at is not None:
+        hours = max((now - state.last_synced_at).total_seconds() / 3600, 1 / 60)
+        sample = stored / hours
+        if state.activity_rate is None:
+            state.activity_rate = sample
+        else:
+            state.activity_rate = SYNC_RATE_SMOOTHING * sample + (1 - SYNC_RATE_SMOOTHING) * state.activity_rate
+
+    if state.activity_rate is None:
+        # First sync pulled history, which says nothing about the rate; look again soon
+        interval = SYNC_MIN_INTERVAL_SECONDS
+    elif state.activity_rate > 0:
+        interval = SYNC_TARGET_PER_SYNC / state.activity_rate * 3600
+    else:
+        interval = SYNC_MAX_INTERVAL_SECONDS
+    interval = int(min(max(interval, SYNC_MIN_INTERVAL_SECONDS), SYNC_MAX_INTERVAL_SECONDS))
+    state.sync_interval_seconds = interval
+    state.next_sync_at = now + timedelta(seconds=interval)
 
-def sync_transactions_for_account(db: Session, account_id: int):
-    """Sync transactions for a specific account"""
-    try:
-        account = db.query(RegisteredUser).filter(RegisteredUser.id == account_id).first()
-        if not account:
-            logger.warning(f"Account {account_id} not found")
-            return
-        
-        # In a real scenario, you would fetch transactions from external bank API
-        # For now, we'll simulate by checking recent transactions and processing them
-        # This is a mock - you would replace this with actual bank API calls
-        
-        logger.info(f"Syncing transactions for account {account_id}")
-        
-        # Get recent transactions (last 24 hours) that might need processing
-        # In real scenario, fetch from bank API
-        # For now, we'll just check budgets and generate alerts
-        
-    except Exception as e:
-        logger.error(f"Error syncing account {account_id}: {str(e)}")
 
+def bump_account_sync(db: Session, account_id: int) -> SyncState:
+    """Move an account to the front of the adaptive sync queue. Does not commit."""
+    state = get_sync_state(db, account_id)
+    state.next_sync_at = FRONT_OF_QUEUE
+    db.flush()
+    return state
 
-def sync_all_accounts():
-    """Sync all registered accounts"""
-    db = SessionLocal()
+
+def sync_all_accounts(max_workers: Optional[int] = None, per_bank_concurrency: Optional[int] = None) -> List[dict]:
+    """Sync all registered accounts concurrently; returns one report entry per account"""
+    db = ReadSessionLocal()
     try:
-        accounts = db.query(RegisteredUser).all()
-        logger.info(f"Starting sync for {len(accounts)} accounts")
-        
-        for account in accounts:
-            sync_transactions_for_account(db, account.id)
-        
-        db.commit()
-        logger.info("Sync completed successfully")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error during sync: {str(e)}")
+        accounts = db.query(RegisteredUser.id, RegisteredUser.bank_id).order_by(RegisteredUser.id).all()
     finally:
         db.close()
+    return sync_accounts(accounts, max_workers, per_bank_concurrency)
 
 
-def update_budget_spent_for_transactions():
-    """Update budget spent based on all DEBIT transactions"""
-    db = SessionLocal()
+def sync_due_accounts(limit: Optional[int] = None, max_workers: Optional[int] = None,
+                      per_bank_concurrency: Optional[int] = None) -> List[dict]:
+    """Sync up to `limit` accounts that are due, most overdue first.
+
+    sync_state.next_sync_at is the priority queue key, served by its index.
+    Accounts that have never synced have no state yet and go first. The
+    selection reads from the replica when one is configured; each account's
+    own sync reads its cursor from the primary.
+    """
+    now = datetime.utcnow()
+    db = ReadSessionLocal()
     try:
-        from schema.models import Transaction, TransactionType, User
-        
-        # Get all DEBIT transactions
-        debit_transactions = db.query(Transaction).filter(
-            Transaction.transaction_type == TransactionType.DEBIT
-        ).all()
-        
-        # Reset all budgets to 0
-        budgets = db.query(Budget).all()
-        for budget in budgets:
-            budget.current_spent = 0.0
-        
-        # Calculate spent for each budget based on transactions
-        for tx in debit_transactions:
-            # Find user_id from account email
-            account = db.query(RegisteredUser).filter(RegisteredUser.id == tx.from_account_id).first()
-            if account:
-                # Try to find user by email
-                user = db.query(User).filter(User.email == account.email).first()
-                if user:
-                    budget = db.query(Budget).filter(
-                        Budget.user_id == user.id,
-                        Budget.category == tx.category
-                    ).first()
-                    if budget:
-                        budget.current_spent += tx.amount
-        
-        db.commit()
-        logger.info("Updated budget spent amounts based on transactions")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error updating budget spent: {str(e)}")
+        accounts = (
+            db.query(RegisteredUser.id, RegisteredUser.bank_id)
+            .outerjoin(SyncState, SyncState.account_id == RegisteredUser.id)
+            .filter(or_(SyncState.next_sync_at.is_(None), SyncState.next_sync_at <= now))
+            .order_by(SyncState.next_sync_at.isnot(None), SyncState.next_sync_at, RegisteredUser.id)
+            .limit(limit or SYNC_DUE_BATCH)
+            .all()
+        )
     finally:
         db.close()
+    if not accounts:
+        return []
+    return sync_accounts(accounts, max_workers, per_bank_concurrency)
+
+
+def sync_accounts(accounts: List[tuple], max_workers: Optional[int] = None,
+                  per_bank_concurrency: Optional[int] = None) -> List[dict]:
+    """Sync the given (account_id, bank_id) pairs concurrently.
+
+    Each account runs on a worker thread with its own session and its own
+    error handling; at most `per_bank_concurrency` accounts of the same bank
+    are fetched at once. Returns one report entry per account.
+    """
+    max_workers = max_workers or SYNC_MAX_WORKERS
+    per_bank_concurrency = per_bank_concurrency or SYNC_PER_BANK_CONCURRENCY
+    logger.info(f"Starting sync for {len(accounts)} accounts")
 
+    # Interleave banks so a busy bank's queued accounts don't block the pool
+    by_bank = {}
+    for account_id, bank_id in accounts:
+        by_bank.setdefault(bank_id, []).append(account_id)
+    bank_slots = {bank_id: threading.BoundedSemaphore(per_bank_concurrency) for bank_id in by_bank}
+    queues = list(by_bank.items())
+    ordered = []
+    for depth in range(max((len(ids) for _, ids in queues), default=0)):
+        for bank_id, ids in queues:
+            if depth < len(ids):
+                ordered.append((ids[depth], bank_id))
 
-def check_budgets_and_generate_alerts():
-    """Check all budgets and generate alerts"""
-    db = SessionLocal()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="account-sync") as pool:
+        futures = [
+            # Each worker runs in a copy of the caller's context, keeping its query_source label
+            pool.submit(contextvars.copy_context().run, _sync_account_worker, account_id, bank_id, bank_slots[bank_id])
+            for account_id, bank_id in ordered
+        ]
+        reports = [future.result() for future in futures]
+
+    failed = sum(1 for report in reports if report["status"] == "error")
+    logger.info(
+        f"Sync completed: {len(reports) - failed} ok, {failed} failed, "
+        f"{sum(report['stored'] for report in reports)} transactions stored "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return reports
+
+
+def category_spend_query():
+    """Aggregate DEBIT spend per (user, category) in a single grouped query"""
+    return (
+        select(
+            RegisteredUser.user_id.label("user_id"),
+            Transaction.category.label("category"),
+            func.sum(Transaction.amount).label("spent")
+        )
+        .select_from(Transaction)
+        .join(RegisteredUser, RegisteredUser.id == Transaction.from_account_id)
+        .where(
+            Transaction.transaction_type == TransactionType.DEBIT,
+            RegisteredUser.user_id.isnot(None)
+        )
+        .group_by(RegisteredUser.user_id, Transaction.category)
+    )
+
+
+def recompute_budget_spent(db: Session) -> int:
+    """Recompute every budget's spent amount from all DEBIT transactions.
+
+    Runs a constant number of statements regardless of transaction volume:
+    one UPDATE resetting every budget, and one UPDATE joined against the
+    grouped spend aggregate, which joins accounts to owners by user_id.
+    Returns the number of budgets with spend. Does not commit.
+    """
+    totals = category_spend_query().subquery("category_spend")
+
+    # Reset all budgets to 0
+    db.execute(
+        update(Budget).values(current_spent=0.0).execution_options(synchronize_session=False)
+    )
+
+    # Apply every (user, category) total in one bulk UPDATE
+    result = db.execute(
+        update(Budget)
+        .where(
+            Budget.user_id == totals.c.user_id,
+            Budget.category == totals.c.category
+        )
+        .values(current_spent=totals.c.spent)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+# ==========================
+# FULL SYNC STAGES
+# ==========================
+
+def _reload_rules_stage(ctx: PipelineContext) -> dict:
+    """Pick up merchant rules added since the last run; a failure keeps the current rules"""
     try:
-        from schema.models import User
-        
-        # First update budget spent amounts
-        update_budget_spent_for_transactions()
-        
-        users = db.query(User).all()
-        logger.info(f"Checking budgets for {len(users)} users")
-        
-        for user in users:
-            # Check category budgets
-            alerts = check_and_generate_budget_alerts(db, user.id)
-            if alerts:
-                logger.info(f"Generated {len(alerts)} budget alerts for user {user.id}")
-            
-            # Check overall balance limit
-            accounts = db.query(RegisteredUser).filter(RegisteredUser.email == user.email).all()
-            total_balance = sum(acc.account_balance for acc in accounts)
-            
-            alert = check_overall_balance_limit_alert(db, user.id, total_balance)
-            if alert:
-                logger.info(f"Generated overall balance limit alert for user {user.id}")
-        
-        db.commit()
-        logger.info("Budget check and alert generation completed")
+        return {"rules": reload_rules(ctx.db).rule_count}
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error checking budgets: {str(e)}")
-    finally:
-        db.close()
+        ctx.db.rollback()
+        logger.error(f"Error reloading category rules: {str(e)}")
+        return {"rules": get_categorizer().rule_count, "error": str(e)}
 
 
-def full_sync_workflow():
-    """Complete sync workflow: fetch → normalize → dedup → categorize → store → check budgets → generate alerts"""
+def _sync_accounts_stage(ctx: PipelineContext) -> dict:
+    # Accounts sync concurrently, each worker on its own session
+    reports = sync_all_accounts()
+    return {
+        "accounts": len(reports),
+        "failed": sum(1 for report in reports if report["status"] == "error"),
+        "stored": sum(report["stored"] for report in reports)
+    }
+
+
+def _update_budgets_stage(ctx: PipelineContext) -> dict:
+    return {"budgets_updated": recompute_budget_spent(ctx.db)}
+
+
+def _generate_alerts_stage(ctx: PipelineContext) -> dict:
+    # Reads the spend update_budgets committed; if this stage fails, the next run regenerates
+    # from that spend, and alerts already stored are skipped as duplicates
+    return {"alerts_created": generate_alerts_bulk(ctx.db)}
+
+
+SYNC_PIPELINE = Pipeline([
+    Stage("reload_rules", _reload_rules_stage),
+    Stage("sync_accounts", _sync_accounts_stage, requires=["reload_rules"]),
+    Stage("update_budgets", _update_budgets_stage, requires=["sync_accounts"]),
+    Stage("generate_alerts", _generate_alerts_stage, requires=["update_budgets"]),
+])
+
+
+def full_sync_workflow(on_stage: Optional[Callable[[str, str, dict], None]] = None) -> dict:
+    """Complete sync workflow: fetch → normalize → dedup → categorize → store → check budgets → generate alerts
+
+    Runs SYNC_PIPELINE, so each stage runs once per sync. `on_stage(stage,
+    status, details)` is called as each stage starts and finishes; sync jobs
+    use it to report progress. Returns {stage: details}.
+    """
     logger.info("=" * 50)
     logger.info("Starting full sync workflow")
     logger.info("=" * 50)
     
-    # Step 1: Sync all accounts (fetch transactions)
-    # In a real scenario, this would fetch from external bank APIs
-    logger.info("Step 1: Syncing accounts...")
-    sync_all_accounts()
-    
-    # Step 2: Update budget spent amounts based on transactions
-    logger.info("Step 2: Updating budget spent amounts...")
-    update_budget_spent_for_transactions()
-    
-    # Step 3: Check budgets and generate alerts
-    logger.info("Step 3: Checking budgets and generating alerts...")
-    check_budgets_and_generate_alerts()
+    results = SYNC_PIPELINE.run(on_stage=on_stage)
     
     logger.info("=" * 50)
     logger.info("Full sync workflow completed")
     logger.info("=" * 50)
-
+    return results